@@ -1,51 +1,66 @@
-from flask import Flask, render_template, request, redirect, url_for, flash
-from flask_login import LoginManager, current_user, login_required
+from flask import Flask, current_app, render_template, request, redirect, url_for, flash
+from flask_login import current_user, login_required
+from config import Config, apply_config
 from auth import auth_bp, login_manager
 from job_predictor import job_predictor_bp
 from ats_score import ats_score_bp
 from job_matcher import job_matcher_bp
-from pymongo import MongoClient
-import PyPDF2
-from dotenv import load_dotenv
-import os
-from datetime import datetime
+from jobs import jobs_bp, job_queue
+import metrics
+import uploads
+import warmup
+from ingest import extract_upload
+from submissions import ensure_indexes
+from db import get_db, user_repository
 
-app = Flask(__name__)   
-load_dotenv()
-app.config['SECRET_KEY'] = os.getenv('SECRET_KEY')
 
-# MongoDB setup
-try:
-    client = MongoClient(os.getenv('MONGO_URI'))
-    db = client.job_portal
-    users_collection = db.users
-except Exception as e:
-    app.logger.error(f"Failed to connect to MongoDB: {e}")
-    raise
+def create_app(config=None):
+    """Build the app from Config plus ``config`` (a dict of overrides), then warm it up.
 
-# Initialize Flask-Login
-login_manager.init_app(app)
-login_manager.login_view = 'auth.login'
+    Usage: gunicorn -c gunicorn.conf.py, or python app.py for the development server.
+    """
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(config or {})
+    app.template_folder = app.config['TEMPLATE_FOLDER']
+    apply_config(app.config)
 
-# Register Blueprints
-app.register_blueprint(auth_bp, url_prefix='/auth')
-app.register_blueprint(job_predictor_bp)
-app.register_blueprint(ats_score_bp)
-app.register_blueprint(job_matcher_bp)
+    # MongoDB setup
+    try:
+        ensure_indexes(get_db())
+    except Exception as e:
+        app.logger.error(f"Failed to connect to MongoDB: {e}")
+        raise
+
+    # Initialize Flask-Login
+    login_manager.init_app(app)
+    login_manager.login_view = 'auth.login'
+
+    # Register Blueprints
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(job_predictor_bp)
+    app.register_blueprint(ats_score_bp)
+    app.register_blueprint(job_matcher_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(warmup.health_bp)
+    app.add_url_rule('/', 'index', index, methods=['GET', 'POST'])
+    metrics.init_app(app)
+    uploads.init_app(app)
+
+    if app.config['WARMUP']:
+        warmup.warm_up()
+    else:
+        # Models and indexes load on first use instead
+        warmup.state['ready'] = True
+    return app
 
 def extract_text_from_pdf(pdf_file):
-    text = ""
     try:
-        reader = PyPDF2.PdfReader(pdf_file)
-        for page in reader.pages:
-            extracted = page.extract_text()
-            text += extracted if extracted else ""
+        return extract_upload(pdf_file).text
     except Exception as e:
-        app.logger.error(f"Error extracting text from PDF: {e}")
+        current_app.logger.error(f"Error extracting text from PDF: {e}")
         return ""
-    return text
 
-@app.route('/', methods=['GET', 'POST'])
 @login_required
 def index():
     if request.method == 'POST':
@@ -61,30 +76,21 @@ def index():
             if not resume_text:
                 flash('Failed to extract text from resume. Ensure it’s a valid PDF.', 'danger')
                 return redirect(url_for('index'))
-            
-            # Prepare submission record
-            submission = {
-                'filename': file.filename,
-                'resume_text': resume_text,
-                'timestamp': datetime.utcnow(),
-                'module': 'index',  # Indicate this is from the index page
-                'output': None  # No specific output for index page
-            }
-            
-            # Update user document with submission history
-            users_collection.update_one(
-                {'email': current_user.id},
-                {'$push': {'submissions': submission}, '$set': {'resume_text': resume_text}},
-                upsert=True
-            )
+
+            # Record the submission in its own collection; the user document keeps only the current resume
+            users = user_repository()
+            users.append_submission(current_user.id, file.filename, resume_text, 'index', None)
+            users.update_resume(current_user.id, resume_text)
             flash('Resume uploaded successfully!', 'success')
         except Exception as e:
             flash(f'Error uploading resume: {str(e)}', 'danger')
             return redirect(url_for('index'))
-    
-    user = users_collection.find_one({'email': current_user.id})
-    resume_exists = bool(user and user.get('resume_text'))
+
+    resume_exists = user_repository().has_resume(current_user.id)
     return render_template('index.html', resume_exists=resume_exists)
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5001)  
\ No newline at end of file
+    app = create_app()
+    warmup.warm_up_worker()
+    job_queue().start()
+    app.run(debug=True, port=5001)
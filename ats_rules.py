@@ -0,0 +1,152 @@
+import re
+from collections import Counter, namedtuple
+from functools import cached_property
+from itertools import islice
+
+MONTHS = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)"
+
+# A rule subtracts ``penalty`` from the formatting score when ``check`` is true.
+Rule = namedtuple('Rule', ['name', 'penalty', 'check'])
+
+
+class ResumeText:
+    """Resume text plus the derived views rules share, each computed at most once."""
+
+    def __init__(self, text, page_count=0):
+        self.text = text
+        self.page_count = page_count
+
+    @cached_property
+    def lower(self):
+        return self.text.lower()
+
+    @cached_property
+    def words(self):
+        return self.text.split()
+
+    @cached_property
+    def word_counts(self):
+        return Counter(self.words)
+
+
+def _exceeds(pattern, text, limit):
+    """True when ``pattern`` matches more than ``limit`` times; stops scanning as soon as it does."""
+    return sum(1 for _ in islice(pattern.finditer(text), limit + 1)) > limit
+
+
+TABLE = re.compile(r'<table|<tr|<td|<th|\|', re.IGNORECASE)
+DATES = [re.compile(p) for p in (r"\b" + MONTHS + r"\s+\d{4}\b", r"\b\d{2}/\d{4}\b", r"\b\d{4}\b")]
+BULLETS = [re.compile(p, re.MULTILINE) for p in (r"^\s*[-•]\s+", r"^\s*\d+\.\s+")]
+HEADER_FOOTER = re.compile(r'header|footer', re.IGNORECASE)
+SYMBOLS = re.compile(r'[✔★►→❖✨]')
+IMAGES = re.compile(r'\.(png|jpg|jpeg|gif|svg)|<img', re.IGNORECASE)
+MARKUP = re.compile(r'\*{1,2}.*?\*{1,2}|_{1,2}.*?_{1,2}')
+NON_ASCII = re.compile(r'[^\x00-\x7F]+')
+EMPHASIS = re.compile(r'(\*\*|\*|__|_)[\w\s]+(\*\*|\*|__|_)')
+SPECIAL_CHARS = re.compile(r'[^\w\s,.!?-]')
+SECTION_HEADERS = ["education", "experience", "skills", "projects", "certifications", "contact", "summary"]
+
+
+def _inconsistent_dates(resume):
+    seen = set()
+    for pattern in DATES:
+        for match in pattern.finditer(resume.text):
+            seen.add(match.group())
+            if len(seen) > 1:
+                return True
+    return False
+
+
+def _few_bullets(resume):
+    count = 0
+    for pattern in BULLETS:
+        for _ in pattern.finditer(resume.text):
+            count += 1
+            if count >= 5:
+                return False
+    return True
+
+
+FORMATTING_RULES = (
+    Rule('too_many_pages', 15, lambda r: r.page_count > 2),
+    Rule('no_paragraph_breaks', 10, lambda r: "\n\n" not in r.text),
+    Rule('tables', 15, lambda r: TABLE.search(r.text) is not None),
+    Rule('inconsistent_dates', 10, _inconsistent_dates),
+    Rule('few_bullets', 10, _few_bullets),
+    Rule('header_footer', 5, lambda r: HEADER_FOOTER.search(r.text) is not None),
+    Rule('symbols', 10, lambda r: SYMBOLS.search(r.text) is not None),
+    Rule('images', 15, lambda r: IMAGES.search(r.text) is not None),
+    Rule('markup', 10, lambda r: _exceeds(MARKUP, r.text, 5)),
+    Rule('non_ascii', 10, lambda r: NON_ASCII.search(r.text) is not None),
+    Rule('emphasis', 10, lambda r: _exceeds(EMPHASIS, r.text, 10)),
+    Rule('missing_headers', 10, lambda r: sum(1 for h in SECTION_HEADERS if h not in r.lower) > 2),
+    Rule('special_chars', 10, lambda r: _exceeds(SPECIAL_CHARS, r.text, 20)),
+    Rule('word_count', 10, lambda r: len(r.words) < 200 or len(r.words) > 1500),
+    Rule('repeated_words', 10, lambda r: sum(1 for c in r.word_counts.values() if c > 10) > 5),
+)
+
+
+def _as_resume(text, page_count=0):
+    return text if isinstance(text, ResumeText) else ResumeText(text, page_count)
+
+
+def formatting_violations(text, page_count=0):
+    resume = _as_resume(text, page_count)
+    return [rule for rule in FORMATTING_RULES if rule.check(resume)]
+
+
+def analyze_formatting(text, page_count):
+    score = 100 - sum(rule.penalty for rule in formatting_violations(text, page_count))
+    return max(score, 0)
+
+
+EXPERIENCE_RANGE = re.compile(r'(\b' + MONTHS + r'\s+\d{4})\s*[-–]\s*(\b' + MONTHS + r'?\s*\d{4}|\bPresent)')
+YEAR = re.compile(r'\d{4}')
+CURRENT_YEAR = 2025
+
+
+def analyze_experience(text):
+    resume = _as_resume(text)
+    has_internship = "internship" in resume.lower
+    work_years = 0
+    for start, end in EXPERIENCE_RANGE.findall(resume.text):
+        end_year = CURRENT_YEAR if 'present' in end.lower() else int(YEAR.search(end).group())
+        work_years += max(0, end_year - int(YEAR.search(start).group()))
+    return min(20 + (work_years * 10), 100) if work_years >= 1 else (40 if has_internship else 20)
+
+
+# Highest matching degree wins; the bonus groups each add their first matching score.
+DEGREE_TIERS = [(re.compile(p), score) for p, score in (
+    (r'\b(phd|doctorate)\b', 100),
+    (r'\b(master|m\.tech|postgraduate|pg diploma)\b', 90),
+    (r'\b(bachelor|b\.tech|under\s?graduation|engineering|bsc|bca)\b', 70),
+    (r'\b(intermediate|12th|higher\s?secondary|junior college)\b', 50),
+    (r'\b(secondary\s?school|10th|high\s?school)\b', 40),
+)]
+EDUCATION_BONUSES = [
+    [(re.compile(r'\b(cgpa|gpa)\s*[:\-]?\s*\d+(\.\d+)?'), 20), (re.compile(r'\bpercentage\s*[:\-]?\s*\d{2,3}'), 15)],
+    [(re.compile(r'\b(university|college|institute|school)\b'), 10)],
+    [(re.compile(r'\b(certified|certification|certificate|course)\b'), 10)],
+]
+
+
+def _first_match_score(tiers, text):
+    for pattern, score in tiers:
+        if pattern.search(text):
+            return score
+    return 0
+
+
+def analyze_education(text):
+    text_lower = _as_resume(text).lower
+    score = _first_match_score(DEGREE_TIERS, text_lower)
+    score += sum(_first_match_score(bonus, text_lower) for bonus in EDUCATION_BONUSES)
+    return min(score, 100)
+
+
+CERTIFICATION_TERMS = ['certified', 'certification', 'certificate']
+
+
+def analyze_certifications(text):
+    text_lower = _as_resume(text).lower
+    return 50 if any(cert in text_lower for cert in CERTIFICATION_TERMS) else 0
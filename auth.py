@@ -1,18 +1,10 @@
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from flask_login import LoginManager, UserMixin, login_user, login_required, logout_user, current_user
-from pymongo import MongoClient
 from werkzeug.security import generate_password_hash,check_password_hash
-import PyPDF2
-from dotenv import load_dotenv
-import os
+from ingest import extract_upload
+from db import user_repository
 
 auth_bp = Blueprint('auth', __name__)
-load_dotenv()
-
-# MongoDB setup
-client = MongoClient(os.getenv('MONGO_URI'))
-db = client.job_portal
-users_collection = db.users
 
 # Flask-Login setup
 login_manager = LoginManager()
@@ -23,8 +15,7 @@ class User(UserMixin):
 
 @login_manager.user_loader
 def load_user(email):
-    user = users_collection.find_one({'email': email})
-    return User(email) if user else None
+    return User(email) if user_repository().exists(email) else None
 
 @auth_bp.route('/register', methods=['GET', 'POST'])
 def register():
@@ -32,14 +23,15 @@ def register():
         email = request.form['email']
         password = request.form['password']
         
-        if users_collection.find_one({'email': email}):
+        users = user_repository()
+        if users.exists(email):
             flash('Email already exists!', 'danger')
             return redirect(url_for('auth.register'))
         
         # ✅ Correct hashing method
         hashed_password = generate_password_hash(password, method='pbkdf2:sha256')
         
-        users_collection.insert_one({'email': email, 'password': hashed_password, 'resume_text': None})
+        users.create_user(email, hashed_password)
         flash('Registration successful! Please log in.', 'success')
         return redirect(url_for('auth.login'))
     
@@ -51,8 +43,8 @@ def login():
     if request.method == 'POST':
         email = request.form['email']
         password = request.form['password']
-        user = users_collection.find_one({'email': email})
-        if user and check_password_hash(user['password'], password):
+        password_hash = user_repository().get_password_hash(email)
+        if password_hash and check_password_hash(password_hash, password):
             login_user(User(email))
             flash('Logged in successfully!', 'success')
             return redirect(url_for('index'))
@@ -67,16 +59,11 @@ def logout():
     return redirect(url_for('auth.login'))
 
 def extract_text_from_pdf(pdf_file):
-    text = ""
     try:
-        reader = PyPDF2.PdfReader(pdf_file)
-        for page in reader.pages:
-            extracted = page.extract_text()
-            text += extracted if extracted else ""
+        return extract_upload(pdf_file).text
     except Exception as e:
         print(f"Error extracting text from PDF: {e}")
         return ""
-    return text
 
 @auth_bp.route('/profile', methods=['GET', 'POST'])
 @login_required
@@ -94,16 +81,22 @@ def profile():
             if not resume_text:
                 flash('Failed to extract text from resume. Ensure it’s a valid PDF.', 'danger')
                 return redirect(url_for('auth.profile'))
-            users_collection.update_one(
-                {'email': current_user.id},
-                {'$set': {'resume_text': resume_text}},
-                upsert=True
-            )
+            user_repository().update_resume(current_user.id, resume_text)
             flash('Resume uploaded successfully!', 'success')
         except Exception as e:
             flash(f'Error uploading resume: {str(e)}', 'danger')
             return redirect(url_for('auth.profile'))
     
-    user = users_collection.find_one({'email': current_user.id})
-    resume_exists = bool(user and user.get('resume_text'))
-    return render_template('profile.html', resume_exists=resume_exists)
\ No newline at end of file
+    resume_exists = user_repository().has_resume(current_user.id)
+    return render_template('profile.html', resume_exists=resume_exists)
+
+@auth_bp.route('/history')
+@login_required
+def history():
+    page = request.args.get('page', 1, type=int)
+    per_page = request.args.get('per_page', 20, type=int)
+    result = user_repository().history(current_user.id, page, per_page, request.args.get('module'))
+    for item in result['items']:
+        item['_id'] = str(item['_id'])
+        item['timestamp'] = item['timestamp'].isoformat()
+    return jsonify(result)
@@ -0,0 +1,305 @@
+"""Score a directory, zip archive or JSONL file of resumes in bulk.
+
+Usage:
+  python batch_score.py resumes/ --job-desc backend.txt --job-desc data.txt --out results.csv
+  python batch_score.py resumes.zip --pipelines ats,predict --out results.jsonl
+
+Resumes are read in batches: each batch is extracted in a process pool while the
+previous one is scored, so memory stays bounded by two batches whatever the input
+size. JSONL input has one object per line with an "id" and either "text" (already
+extracted, optional "page_count") or "path" (a PDF/DOCX file).
+
+After every batch the output is flushed and a checkpoint records how many inputs are
+done. Re-running the same command resumes from there; rows written after the last
+checkpoint are discarded first. A checkpoint written with another input, pipelines,
+job descriptions or format, or whose output file is gone, is refused. Pass --restart
+to start over.
+"""
+import argparse
+import csv
+import io
+import itertools
+import json
+import multiprocessing
+import os
+import sys
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+# Files are extracted in parallel across the pool; splitting one PDF's pages over a
+# second pool inside each worker would only oversubscribe the CPUs.
+os.environ.setdefault('INGEST_WORKERS', '1')
+
+from cache import content_hash
+from ingest import FORMATS, extract_bytes
+
+PIPELINES = ('ats', 'match', 'predict')
+ATS_FIELDS = ('overall_score', 'formatting_score', 'experience_score', 'skills_score', 'education_score', 'cert_score')
+MATCH_FIELDS = ('score', 'semantic', 'tfidf', 'fuzzy')
+
+
+# --- Input sources: each yields (item_id, load) in a stable order; load() gives the item ---
+
+def iter_directory(path):
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in FORMATS:
+                file_path = os.path.join(root, name)
+                yield os.path.relpath(file_path, path), lambda file_path=file_path: _read_file(file_path)
+
+
+def iter_zip(path):
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and os.path.splitext(info.filename)[1].lower() in FORMATS:
+                yield info.filename, lambda info=info: ('file', info.filename, archive.read(info))
+
+
+def iter_jsonl(path):
+    base = os.path.dirname(os.path.abspath(path))
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            item_id = str(record.get('id', line_number))
+            if 'text' in record:
+                yield item_id, lambda record=record: ('text', record['text'], record.get('page_count', 1))
+            else:
+                yield item_id, lambda record=record: _read_file(os.path.join(base, record['path']))
+
+
+def _read_file(path):
+    with open(path, 'rb') as f:
+        return 'file', path, f.read()
+
+
+def open_source(path):
+    if os.path.isdir(path):
+        return iter_directory(path)
+    if zipfile.is_zipfile(path):
+        return iter_zip(path)
+    if path.endswith('.jsonl'):
+        return iter_jsonl(path)
+    raise ValueError(f"Expected a directory, a .zip or a .jsonl file: {path}")
+
+
+# --- Extraction (runs in the pool) ---
+
+def extract_item(item):
+    """(text, page_count, error) for one loaded input."""
+    if item[0] == 'text':
+        return item[1] or "", item[2], None
+    _, filename, data = item
+    try:
+        document = extract_bytes(data, filename)
+    except Exception as e:
+        return "", 0, str(e) or type(e).__name__
+    return document.text, document.page_count, None
+
+
+# --- Scoring ---
+
+class BatchScorer:
+    """Runs the selected pipelines over one batch of extracted resumes at a time."""
+
+    def __init__(self, pipelines, job_descs):
+        self.pipelines = pipelines
+        self.job_descs = job_descs
+        # Imported here so the extraction workers don't load the models
+        if 'ats' in pipelines:
+            from ats_score import score_resume
+            self.score_resume = score_resume
+        if 'match' in pipelines:
+            from matcher import rank_resumes
+            self.rank_resumes = rank_resumes
+        if 'predict' in pipelines:
+            from job_predictor import predict_job_titles, get_job_index
+            self.predict_job_titles = predict_job_titles
+            self.job_index = get_job_index()
+
+    def score(self, items):
+        """items: [(item_id, text, page_count, error)] -> one result dict per item."""
+        results = [{'id': item_id, 'error': error} for item_id, _, _, error in items]
+        ok = [i for i, (_, text, _, error) in enumerate(items) if not error and text.strip()]
+        for i, (_, text, _, error) in enumerate(items):
+            if not error and not text.strip():
+                results[i]['error'] = 'No text extracted'
+        texts = [items[i][1] for i in ok]
+        if not texts:
+            return results
+
+        if 'ats' in self.pipelines:
+            for i in ok:
+                results[i]['ats'] = self.score_resume(items[i][1], items[i][2])
+        if 'match' in self.pipelines:
+            for name, job_desc in self.job_descs.items():
+                for ranked in self.rank_resumes(job_desc, texts):
+                    results[ok[ranked.pop('index')]].setdefault('match', {})[name] = ranked
+        if 'predict' in self.pipelines:
+            for i, jobs in zip(ok, self.predict_job_titles(texts, self.job_index)):
+                results[i]['predicted_jobs'] = jobs or []
+        return results
+
+
+# --- Output ---
+
+class JsonlWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def write(self, result):
+        self.f.write(json.dumps(result) + "\n")
+
+
+class CsvWriter:
+    """One row per resume with a fixed set of columns, known up front."""
+
+    def __init__(self, f, pipelines, job_names, write_header):
+        self.columns = ['id', 'error']
+        if 'ats' in pipelines:
+            self.columns += [f'ats_{field}' for field in ATS_FIELDS]
+        if 'match' in pipelines:
+            self.columns += [f'match_{name}_{field}' for name in job_names for field in MATCH_FIELDS]
+        if 'predict' in pipelines:
+            self.columns.append('predicted_jobs')
+        self.writer = csv.DictWriter(f, self.columns)
+        if write_header:
+            self.writer.writeheader()
+
+    def write(self, result):
+        row = {'id': result['id'], 'error': result.get('error') or ''}
+        for field, value in result.get('ats', {}).items():
+            row[f'ats_{field}'] = value
+        for name, match in result.get('match', {}).items():
+            for field in MATCH_FIELDS:
+                row[f'match_{name}_{field}'] = match[field]
+        if 'predicted_jobs' in result:
+            row['predicted_jobs'] = "; ".join(f"{job['Job Title']} ({job['Skills Match']:.1f}%)"
+                                              for job in result['predicted_jobs'])
+        self.writer.writerow(row)
+
+
+# --- Checkpoints ---
+
+def read_checkpoint(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def check_resumable(checkpoint, settings, out_path):
+    """Stop unless ``checkpoint`` was written by this same run and its output is intact."""
+    changed = [key for key, value in settings.items() if checkpoint.get(key) != value]
+    if changed:
+        raise SystemExit(f"The checkpoint is from another run ({', '.join(changed)} differ); "
+                         f"pass --restart to start over")
+    if not os.path.exists(out_path) or os.path.getsize(out_path) < checkpoint['output_bytes']:
+        raise SystemExit(f"{out_path} is missing or shorter than the checkpoint records; "
+                         f"pass --restart to start over")
+
+
+def write_checkpoint(path, checkpoint):
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(checkpoint, f)
+    os.replace(tmp_path, path)
+
+
+def batches(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def run(args):
+    if args.pipelines is None:
+        # Matching needs a job description to match against
+        pipelines = [name for name in PIPELINES if name != 'match' or args.job_desc]
+    else:
+        pipelines = [name for name in args.pipelines.split(',') if name]
+    job_descs = {}
+    for path in args.job_desc:
+        with open(path, encoding='utf-8') as f:
+            job_descs[os.path.splitext(os.path.basename(path))[0]] = f.read()
+    if 'match' in pipelines and not job_descs:
+        raise SystemExit("The match pipeline needs at least one --job-desc file")
+
+    fmt = args.format or ('csv' if args.out.endswith('.csv') else 'jsonl')
+    # A checkpoint only resumes the run that wrote it
+    settings = {
+        'source': os.path.abspath(args.input),
+        'pipelines': pipelines,
+        'job_descs': {name: content_hash(job_desc) for name, job_desc in job_descs.items()},
+        'format': fmt,
+    }
+    checkpoint_path = args.checkpoint or f'{args.out}.checkpoint'
+    checkpoint = None if args.restart else read_checkpoint(checkpoint_path)
+    if checkpoint:
+        check_resumable(checkpoint, settings, args.out)
+    done = checkpoint['done'] if checkpoint else 0
+
+    # Binary underneath, so the checkpoint's offsets are byte counts
+    out_bytes = open(args.out, 'r+b' if checkpoint else 'wb')
+    if checkpoint:
+        # Drop anything written after the last checkpoint, then append
+        out_bytes.seek(checkpoint['output_bytes'])
+        out_bytes.truncate()
+    out = io.TextIOWrapper(out_bytes, encoding='utf-8', newline='')
+    writer = CsvWriter(out, pipelines, list(job_descs), write_header=not checkpoint) if fmt == 'csv' else JsonlWriter(out)
+
+    scorer = BatchScorer(pipelines, job_descs)
+    # Each item is loaded as soon as it is read, while its source is still open: a
+    # zip archive closes once its last member has been read
+    items = ((item_id, load()) for item_id, load in itertools.islice(open_source(args.input), done, None))
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=args.workers, mp_context=context) as pool:
+        pending = None
+        for batch in itertools.chain(batches(items, args.batch_size), [None]):
+            # Extraction of this batch overlaps with scoring of the previous one
+            submitted = None
+            if batch is not None:
+                submitted = ([item_id for item_id, _ in batch], pool.map(extract_item, [item for _, item in batch]))
+            if pending is not None:
+                ids, extracted = pending
+                for result in scorer.score([(item_id, *item) for item_id, item in zip(ids, extracted)]):
+                    writer.write(result)
+                out.flush()
+                os.fsync(out_bytes.fileno())
+                done += len(ids)
+                write_checkpoint(checkpoint_path, dict(settings, done=done, output_bytes=out_bytes.tell()))
+                print(f"{done} resumes scored", file=sys.stderr)
+            pending = submitted
+    out.close()
+    return done
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Score resumes in bulk.")
+    arg_parser.add_argument('input', help="Directory, .zip archive or .jsonl file of resumes")
+    arg_parser.add_argument('--out', required=True, help="Output file (.csv or .jsonl)")
+    arg_parser.add_argument('--format', choices=['csv', 'jsonl'], help="Output format (default: from --out)")
+    arg_parser.add_argument('--job-desc', action='append', default=[],
+                            help="Job description text file to match against (repeatable)")
+    arg_parser.add_argument('--pipelines', help="Comma-separated: ats, match, predict "
+                                                "(default: ats and predict, plus match with --job-desc)")
+    arg_parser.add_argument('--batch-size', type=int, default=32)
+    arg_parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    arg_parser.add_argument('--checkpoint', help="Checkpoint file (default: <out>.checkpoint)")
+    arg_parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+    args = arg_parser.parse_args()
+
+    unknown = set((args.pipelines or '').split(',')) - set(PIPELINES) - {''}
+    if unknown:
+        arg_parser.error(f"unknown pipelines: {', '.join(sorted(unknown))}")
+    run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""Benchmark: compiled ATS rule set vs. the original per-call regex analyzers.
+
+Checks that every score is identical and times both from 200 to 5,000 words.
+Run from the project root:  python benchmarks/bench_ats_rules.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ats_rules import ResumeText, analyze_formatting, analyze_experience, analyze_education, analyze_certifications
+
+SECTIONS = ["Summary", "Experience", "Education", "Skills", "Projects", "Certifications", "Contact"]
+WORDS = ("python java sql docker aws team lead developed built designed deployed data pipeline "
+         "university bachelor b.tech gpa certified course internship header | * ** _ ✔ "
+         "analysis model api service improved reduced latency by 30% using kubernetes").split()
+
+
+# --- Original implementations, kept verbatim as the reference ---
+
+def legacy_analyze_formatting(text, page_count):
+    score = 100
+    text_lower = text.lower()
+    if page_count > 2: score -= 15
+    if "\n\n" not in text: score -= 10
+    if re.search(r'<table|<tr|<td|<th|\|', text, re.IGNORECASE): score -= 15
+    date_patterns = [r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}\b", r"\b\d{2}/\d{4}\b", r"\b\d{4}\b"]
+    found_dates = [re.findall(pattern, text) for pattern in date_patterns]
+    found_dates = [date for sublist in found_dates for date in sublist]
+    if len(set(found_dates)) > 1: score -= 10
+    bullet_count = sum(len(re.findall(pattern, text, re.MULTILINE)) for pattern in [r"^\s*[-•]\s+", r"^\s*\d+\.\s+"])
+    if bullet_count < 5: score -= 10
+    if re.search(r'header|footer', text, re.IGNORECASE): score -= 5
+    if re.search(r'[✔★►→❖✨]', text): score -= 10
+    if re.search(r'\.(png|jpg|jpeg|gif|svg)|<img', text, re.IGNORECASE): score -= 15
+    if len(re.findall(r'\*{1,2}.*?\*{1,2}|_{1,2}.*?_{1,2}', text)) > 5: score -= 10
+    if re.search(r'[^\x00-\x7F]+', text): score -= 10
+    if len(re.findall(r'(\*\*|\*|__|_)[\w\s]+(\*\*|\*|__|_)', text)) > 10: score -= 10
+    missing_headers = sum(1 for header in ["education", "experience", "skills", "projects", "certifications", "contact", "summary"] if header not in text_lower)
+    if missing_headers > 2: score -= 10
+    if len(re.findall(r'[^\w\s,.!?-]', text)) > 20: score -= 10
+    word_count = len(text.split())
+    if word_count < 200 or word_count > 1500: score -= 10
+    repeated_words = {word for word in text.split() if text.split().count(word) > 10}
+    if len(repeated_words) > 5: score -= 10
+    return max(score, 0)
+
+def legacy_analyze_experience(text):
+    text_lower = text.lower()
+    has_internship = "internship" in text_lower
+    experience_patterns = re.findall(r'(\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4})\s*[-–]\s*(\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)?\s*\d{4}|\bPresent)', text)
+    work_years = sum(max(0, (2025 if 'present' in end.lower() else int(re.search(r'\d{4}', end).group())) - int(re.search(r'\d{4}', start).group())) for start, end in experience_patterns)
+    return min(20 + (work_years * 10), 100) if work_years >= 1 else (40 if has_internship else 20)
+
+def legacy_analyze_education(text):
+    text_lower = text.lower()
+    score = 0
+    if re.search(r'\b(phd|doctorate)\b', text_lower): score = 100
+    elif re.search(r'\b(master|m\.tech|postgraduate|pg diploma)\b', text_lower): score = 90
+    elif re.search(r'\b(bachelor|b\.tech|under\s?graduation|engineering|bsc|bca)\b', text_lower): score = 70
+    elif re.search(r'\b(intermediate|12th|higher\s?secondary|junior college)\b', text_lower): score = 50
+    elif re.search(r'\b(secondary\s?school|10th|high\s?school)\b', text_lower): score = 40
+    if re.search(r'\b(cgpa|gpa)\s*[:\-]?\s*\d+(\.\d+)?', text_lower): score += 20
+    elif re.search(r'\bpercentage\s*[:\-]?\s*\d{2,3}', text_lower): score += 15
+    if re.search(r'\b(university|college|institute|school)\b', text_lower): score += 10
+    if re.search(r'\b(certified|certification|certificate|course)\b', text_lower): score += 10
+    return min(score, 100)
+
+def legacy_analyze_certifications(text):
+    text_lower = text.lower()
+    return 50 if any(cert in text_lower for cert in ['certified', 'certification', 'certificate']) else 0
+
+
+def make_resume(words, rng):
+    lines = []
+    written = 0
+    while written < words:
+        if rng.random() < 0.08:
+            lines.append("")
+            lines.append(rng.choice(SECTIONS))
+        start = rng.randint(2012, 2022)
+        prefix = rng.choice(["- ", "• ", "1. ", ""])
+        line = [rng.choice(WORDS) for _ in range(rng.randint(6, 14))]
+        if rng.random() < 0.2:
+            line.append(f"{rng.choice(['Jan', 'Jun', 'Sep'])} {start} - {rng.choice(['Present', 'Dec ' + str(start + 2)])}")
+        lines.append(prefix + " ".join(line))
+        written += len(line)
+    return "\n".join(lines)
+
+
+def legacy_all(text, pages):
+    return (legacy_analyze_formatting(text, pages), legacy_analyze_experience(text),
+            legacy_analyze_education(text), legacy_analyze_certifications(text))
+
+
+def compiled_all(text, pages):
+    resume = ResumeText(text, pages)
+    return (analyze_formatting(resume, pages), analyze_experience(resume),
+            analyze_education(resume), analyze_certifications(resume))
+
+
+def best_time(func, *args, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    rng = random.Random(7)
+    print(f"{'words':>6} {'original ms':>12} {'compiled ms':>12} {'speedup':>8}")
+    for words in (200, 500, 1000, 2000, 5000):
+        for _ in range(20):
+            text = make_resume(words, rng)
+            pages = rng.randint(1, 4)
+            assert legacy_all(text, pages) == compiled_all(text, pages)
+        expected, legacy_time = best_time(legacy_all, text, pages)
+        result, compiled_time = best_time(compiled_all, text, pages)
+        assert result == expected
+        print(f"{words:>6} {legacy_time * 1000:>12.2f} {compiled_time * 1000:>12.2f} {legacy_time / compiled_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark: startup cost of the job dataset, old per-blueprint reads vs. the cached loader.
+
+Writes a synthetic data.csv, then times the three ``pd.read_csv`` calls the blueprints
+used to make against a cold and a warm ``dataset.load_dataset``.
+Run from the project root:  python benchmarks/bench_dataset.py [rows]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+from dataset import load_dataset
+from skill_dictionary import SkillDictionary
+
+SKILLS = ("python java sql docker aws kubernetes spark airflow react node.js c++ excel tableau "
+          "tensorflow pytorch linux git jenkins terraform go rust scala hadoop").split()
+SOFT = ["communication", "teamwork", "leadership", "problem-solving", "adaptability"]
+
+
+def write_csv(path, rows, rng):
+    pd.DataFrame({
+        "Job Title": [f"Job {i % 500}" for i in range(rows)],
+        "IT Skills": [", ".join(rng.sample(SKILLS, rng.randint(3, 8))) for _ in range(rows)],
+        "Soft Skills": [", ".join(rng.sample(SOFT, 2)) for _ in range(rows)],
+        "Description": ["lorem ipsum " * 20] * rows,
+    }).to_csv(path, index=False)
+
+
+def legacy_startup(path):
+    job_data = pd.read_csv(path)
+    for _ in range(2):
+        df = pd.read_csv(path, encoding="ISO-8859-1", usecols=["IT Skills"])
+        SkillDictionary.from_series(df["IT Skills"])
+    return job_data
+
+
+def cached_startup(path, cache_dir):
+    dataset = load_dataset(path, cache_dir)
+    SkillDictionary(dataset.it_skill_vocabulary())
+    return dataset
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'data.csv')
+        cache_dir = os.path.join(tmp, 'cache')
+        write_csv(path, rows, random.Random(0))
+        print(f"rows: {rows}")
+        print(f"three pd.read_csv calls: {timed(legacy_startup, path):8.1f} ms")
+        print(f"load_dataset, cold:      {timed(cached_startup, path, cache_dir):8.1f} ms")
+        print(f"load_dataset, warm:      {timed(cached_startup, path, cache_dir):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark: spaCy cost of the phrase extraction in one /job_matcher request.
+
+A job_matcher request extracts key phrases from the resume and the job description
+twice: matcher.extract_key_phrases (inside hybrid_match_score) and
+job_matcher.extract_phrases. The previous implementations, kept below as the
+reference, parsed the whole text separately for each. Both now share one cached
+analysis of the whole text. The script checks that the phrases are identical and
+times both approaches with cold caches. Needs the spaCy model.
+Run from the project root:  python benchmarks/bench_doc_analysis.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nlp_runtime
+import synthetic
+from doc_analysis import phrase_cache
+
+STOP_PHRASES = {
+    "communication", "team", "work", "responsibilities", "skills",
+    "development", "experience", "knowledge", "ability", "role", "scripting skills"
+}
+
+
+# --- Previous implementations: one spaCy pass per extractor ---
+
+def legacy_key_phrases_from_doc(doc):
+    phrases = set()
+    for chunk in doc.noun_chunks:
+        phrase = chunk.text.strip()
+        if 2 < len(phrase) < 50 and phrase.count(" ") <= 3:
+            if any(char.isalpha() for char in phrase):
+                phrases.add(phrase)
+    for token in doc:
+        if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop:
+            if len(token.text) > 3:
+                phrases.add(token.lemma_.strip())
+    return phrases
+
+
+def legacy_job_phrases_from_doc(doc):
+    phrases = set()
+    for chunk in doc.noun_chunks:
+        phrase = chunk.text.strip()
+        if 2 < len(phrase) < 50 and phrase.count(" ") <= 3:
+            if any(char.isalpha() for char in phrase) and phrase not in STOP_PHRASES:
+                phrases.add(phrase)
+    for token in doc:
+        if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop:
+            if len(token.text) > 3 and token.text.lower() not in STOP_PHRASES:
+                phrases.add(token.lemma_.strip())
+    return phrases
+
+
+def legacy_extract(text, from_doc):
+    return from_doc(nlp_runtime.parse(text.lower(), nlp_runtime.PHRASES))
+
+
+def legacy_request(resume, job_desc):
+    return [legacy_extract(text, from_doc) for from_doc in (legacy_key_phrases_from_doc, legacy_job_phrases_from_doc)
+            for text in (resume, job_desc)]
+
+
+def shared_request(resume, job_desc):
+    from matcher import extract_key_phrases
+    from job_matcher import extract_phrases
+    return [set(extract_key_phrases(resume)), set(extract_key_phrases(job_desc)),
+            extract_phrases(resume), extract_phrases(job_desc)]
+
+
+def main():
+    rng = synthetic.rng_for(0)
+    nlp_runtime.get_nlp()
+    import job_matcher  # loads the dataset; keep that out of the timings
+    print(f"{'pages':>5} {'legacy ms':>10} {'shared ms':>10} {'speedup':>8}")
+    for pages in (1, 2, 4):
+        resume = synthetic.make_resume(rng, pages)
+        job_desc = synthetic.make_job_desc(rng, 250)
+
+        start = time.perf_counter()
+        expected = legacy_request(resume, job_desc)
+        legacy_time = time.perf_counter() - start
+
+        phrase_cache.clear()
+        start = time.perf_counter()
+        found = shared_request(resume, job_desc)
+        shared_time = time.perf_counter() - start
+
+        assert found == expected, pages
+        print(f"{pages:>5} {legacy_time * 1000:>10.1f} {shared_time * 1000:>10.1f} {legacy_time / shared_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
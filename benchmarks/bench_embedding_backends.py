@@ -0,0 +1,98 @@
+"""Benchmark: speed and accuracy drift of the embedding backends against float torch.
+
+Encodes a fixed synthetic corpus (seeded resumes and job descriptions, split into
+sentences the way matcher does) with each backend and reports encode throughput,
+the lowest cosine between a sentence's vector and its float vector, and how far the
+semantic scores of every resume/JD pair move. It exits non-zero when any pair's
+score drifts by more than --max-drift points, so it can gate a backend switch.
+
+The onnx backend needs a model exported with ``python embedding_backends.py export``.
+Run from the project root:
+  python benchmarks/bench_embedding_backends.py --backends int8,onnx --threads 4
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import synthetic
+from embedding_backends import BACKENDS, load_embedding_model
+from matcher import split_sentences
+
+
+def make_corpus(resumes, job_descs, seed):
+    rng = synthetic.rng_for(seed)
+    return ([split_sentences(synthetic.make_resume(rng)) for _ in range(resumes)],
+            [split_sentences(synthetic.make_job_desc(rng)) for _ in range(job_descs)])
+
+
+def encode(model, documents):
+    sentences = [sentence for sentences in documents for sentence in sentences]
+    start = time.perf_counter()
+    vectors = np.asarray(model.encode(sentences, convert_to_numpy=True, batch_size=64), dtype=np.float32)
+    elapsed = time.perf_counter() - start
+    return vectors, len(sentences) / elapsed
+
+
+def document_means(vectors, documents):
+    bounds = np.cumsum([0] + [len(sentences) for sentences in documents])
+    return np.vstack([vectors[start:end].mean(axis=0) for start, end in zip(bounds[:-1], bounds[1:])])
+
+
+def unit(rows):
+    return rows / np.maximum(np.linalg.norm(rows, axis=1, keepdims=True), 1e-8)
+
+
+def semantic_scores(vectors, resumes, job_descs):
+    """hybrid_match_score's semantic component for every (resume, JD) pair."""
+    resume_vectors = vectors[:sum(len(s) for s in resumes)]
+    job_vectors = vectors[len(resume_vectors):]
+    return unit(document_means(resume_vectors, resumes)) @ unit(document_means(job_vectors, job_descs)).T * 100
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare embedding backends against float torch.")
+    arg_parser.add_argument('--backends', default='int8,onnx', help="Comma-separated backends to compare")
+    arg_parser.add_argument('--threads', type=int, default=os.cpu_count() or 1)
+    arg_parser.add_argument('--resumes', type=int, default=40)
+    arg_parser.add_argument('--job-descs', type=int, default=10)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--max-drift', type=float, default=1.0,
+                            help="Largest acceptable change of a semantic score, in points out of 100")
+    args = arg_parser.parse_args()
+    backends = [name for name in args.backends.split(',') if name and name != 'torch']
+    unknown = set(backends) - set(BACKENDS)
+    if unknown:
+        arg_parser.error(f"unknown backends: {', '.join(sorted(unknown))}")
+
+    resumes, job_descs = make_corpus(args.resumes, args.job_descs, args.seed)
+    documents = resumes + job_descs
+    reference, throughput = encode(load_embedding_model('torch', args.threads), documents)
+    reference_scores = semantic_scores(reference, resumes, job_descs)
+    reference_best = reference_scores.argmax(axis=0)
+
+    print(f"{len(reference)} sentences, {len(resumes)} x {len(job_descs)} pairs, {args.threads} threads")
+    print(f"{'backend':>8} {'sent/s':>9} {'speedup':>8} {'min cos':>8} {'mean |d|':>9} {'max |d|':>8} {'top-1':>6}")
+    print(f"{'torch':>8} {throughput:9.1f} {1:8.2f}x {1:8.4f} {0:9.3f} {0:8.3f} {1:6.0%}")
+    failed = False
+    for name in backends:
+        model = load_embedding_model(name, args.threads)
+        vectors, backend_throughput = encode(model, documents)
+        cosines = (unit(vectors) * unit(reference)).sum(axis=1)
+        scores = semantic_scores(vectors, resumes, job_descs)
+        drift = np.abs(scores - reference_scores)
+        # Share of job descriptions whose best-matching resume is unchanged
+        top1 = (scores.argmax(axis=0) == reference_best).mean()
+        print(f"{name:>8} {backend_throughput:9.1f} {backend_throughput / throughput:8.2f}x {cosines.min():8.4f} "
+              f"{drift.mean():9.3f} {drift.max():8.3f} {top1:6.0%}")
+        failed |= drift.max() > args.max_drift
+    if failed:
+        print(f"Semantic scores drifted by more than {args.max_drift} points")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
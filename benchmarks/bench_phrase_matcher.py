@@ -0,0 +1,56 @@
+"""Micro-benchmark: indexed phrase matcher vs. the all-pairs token_set_ratio loop.
+
+Run from the project root:  python benchmarks/bench_phrase_matcher.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fuzzywuzzy import fuzz
+from phrase_matcher import count_fuzzy_hits
+
+WORDS = [
+    "python", "java", "javascript", "react", "node", "sql", "mysql", "postgresql", "cloud",
+    "aws", "azure", "docker", "kubernetes", "data", "analysis", "analytics", "machine",
+    "learning", "deep", "model", "models", "pipeline", "pipelines", "team", "lead",
+    "leadership", "project", "management", "software", "engineer", "engineering",
+    "development", "developer", "testing", "automation", "design", "system", "systems",
+    "api", "apis", "microservices", "security", "network", "linux", "git", "agile", "scrum",
+]
+
+
+def make_phrases(n, rng):
+    return [" ".join(rng.sample(WORDS, rng.randint(1, 4))) for _ in range(n)]
+
+
+def naive_hits(job_phrases, resume_phrases):
+    return sum(1 for j in job_phrases for r in resume_phrases if fuzz.token_set_ratio(j, r) > 85)
+
+
+def timed(func, *args, repeat=3):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'phrases':>8} {'naive ms':>10} {'indexed ms':>11} {'speedup':>8} {'hits':>6}")
+    for size in (25, 50, 100, 200, 400):
+        job_phrases = make_phrases(size, rng)
+        resume_phrases = make_phrases(size, rng)
+        expected, naive_time = timed(naive_hits, job_phrases, resume_phrases)
+        hits, indexed_time = timed(count_fuzzy_hits, job_phrases, resume_phrases)
+        assert hits == expected, (hits, expected)
+        print(f"{size:>8} {naive_time * 1000:>10.1f} {indexed_time * 1000:>11.1f} "
+              f"{naive_time / indexed_time:>7.1f}x {hits:>6}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark: re-scoring a resume after a one-line edit, and resubmitting it unchanged.
+
+Scores a resume against a job description with cold caches, edits one line, and
+re-scores it with the caches left warm. Sentence embeddings are cached per sentence,
+so only the edited sentence is re-encoded; phrase analyses are cached by exact text,
+so the edited resume is parsed again in full while the job description's parse is
+reused. Checks that the warm score is identical to a cold-cache full recompute, and
+also times an unchanged resubmission. Needs the spaCy and sentence-transformer models.
+Run from the project root:  python benchmarks/bench_rescore.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import nlp_runtime
+from doc_analysis import phrase_cache
+from matcher import hybrid_match_score
+
+WORDS = ("python java sql docker aws team lead developed built designed deployed data pipeline "
+         "analysis model api service improved reduced latency using kubernetes customer reporting "
+         "dashboards machine learning spark airflow testing migration platform engineers").split()
+
+JOB_DESC = "\n".join([
+    "We are hiring a data engineer to build and run batch and streaming data pipelines.",
+    "You will design APIs and services on AWS with Docker and Kubernetes.",
+    "Strong Python and SQL skills, experience with Spark and Airflow, and a focus on testing.",
+])
+
+
+def make_lines(lines, rng):
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + "."
+            for _ in range(lines)]
+
+
+def reset_caches():
+    phrase_cache.clear()
+    nlp_runtime.get_embedding_service().cache.clear()
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(0)
+    print(f"{'lines':>6} {'full ms':>10} {'edit ms':>10} {'speedup':>8} {'resubmit ms':>12}")
+    for lines in (20, 60, 150):
+        resume = "\n".join(make_lines(lines, rng))
+        edited_lines = resume.split("\n")
+        edited_lines[lines // 2] = make_lines(1, rng)[0]
+        edited = "\n".join(edited_lines)
+
+        reset_caches()
+        hybrid_match_score(resume, JOB_DESC)
+        warm, edit_time = timed(hybrid_match_score, edited, JOB_DESC)
+        resubmitted, resubmit_time = timed(hybrid_match_score, edited, JOB_DESC)
+
+        reset_caches()
+        full, full_time = timed(hybrid_match_score, edited, JOB_DESC)
+
+        assert warm == resubmitted == full, (lines, warm, resubmitted, full)
+        print(f"{lines:>6} {full_time * 1000:>10.1f} {edit_time * 1000:>10.1f} "
+              f"{full_time / edit_time:>7.1f}x {resubmit_time * 1000:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: recall and latency of the IVF job index against exact search.
+
+Builds synthetic skill catalogues (jobs drawn from overlapping skill families) of
+increasing size, and for each reports build time, top-5 query latency (p50/p99)
+and recall@5 of the IVF index relative to the exact index.
+Run from the project root:  python benchmarks/bench_similarity_index.py [rows ...]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from similarity_index import ExactIndex, IVFIndex
+
+FAMILIES = 300
+SKILLS_PER_FAMILY = 40
+VOCABULARY = [f"skill{i}" for i in range(4000)]
+QUERIES = 200
+K = 5
+
+
+def make_catalogue(rows, rng):
+    families = [rng.sample(VOCABULARY, SKILLS_PER_FAMILY) for _ in range(FAMILIES)]
+    texts = []
+    for _ in range(rows):
+        family = rng.choice(families)
+        skills = rng.sample(family, rng.randint(4, 10)) + rng.sample(VOCABULARY, rng.randint(0, 2))
+        texts.append(" ".join(skills))
+    return texts
+
+
+def percentile_ms(samples, q):
+    return np.percentile(samples, q) * 1000
+
+
+def run(rows, rng):
+    texts = make_catalogue(rows, rng)
+    vectorizer = TfidfVectorizer(sublinear_tf=True)
+    matrix = vectorizer.fit_transform(texts).tocsr()
+    queries = [vectorizer.transform([" ".join(rng.sample(rng.choice(texts).split(), 3) + rng.sample(VOCABULARY, 1))])
+               for _ in range(QUERIES)]
+
+    exact = ExactIndex.build(matrix)
+    start = time.perf_counter()
+    ivf = IVFIndex.build(matrix)
+    build_time = time.perf_counter() - start
+
+    exact_times, ivf_times, hits = [], [], 0
+    for query in queries:
+        start = time.perf_counter()
+        expected = exact.search(query, K)
+        exact_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        found = ivf.search(query, K)
+        ivf_times.append(time.perf_counter() - start)
+        # Count ties with the k-th exact score as hits: any of them is an equally good answer.
+        scores = (matrix @ query.T).toarray().ravel()
+        kth = scores[expected[-1]]
+        hits += sum(1 for row in found if scores[row] >= kth)
+
+    print(f"{rows:>8} {build_time:>8.1f}s {len(ivf.centroids):>6} "
+          f"{percentile_ms(exact_times, 50):>9.2f} {percentile_ms(exact_times, 99):>9.2f} "
+          f"{percentile_ms(ivf_times, 50):>9.2f} {percentile_ms(ivf_times, 99):>9.2f} "
+          f"{hits / (QUERIES * K):>8.3f}")
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 50000, 200000]
+    rng = random.Random(0)
+    print(f"{'rows':>8} {'build':>9} {'lists':>6} {'exact p50':>9} {'exact p99':>9} "
+          f"{'ivf p50':>9} {'ivf p99':>9} {'recall@5':>8}")
+    for rows in sizes:
+        run(rows, rng)
+
+
+if __name__ == '__main__':
+    main()
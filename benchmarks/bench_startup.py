@@ -0,0 +1,123 @@
+"""Benchmark: time to first request and memory of N gunicorn workers, with and without warm-up.
+
+For WARMUP=1 (dataset, spaCy and indexes warmed up in the master before fork, the
+embedding model in each worker's post_fork) and WARMUP=0 (everything loaded lazily
+by each worker), starts gunicorn with the repo's
+gunicorn.conf.py and reports:
+- ready_s: from launch until /readyz answers 200;
+- first_ms: latency of the first POST /ats_score wave, one request per worker at once;
+- warm_ms: the same for a second wave, once every worker has served a request;
+- pss_mb: proportional set size of the master plus workers after both waves, which
+  counts pages shared copy-on-write only once.
+
+Needs gunicorn, requests, a MongoDB at MONGO_URI and Linux (/proc). Run from the
+project root:  python benchmarks/bench_startup.py --workers 4 [--out startup.json]
+"""
+import argparse
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import requests
+import synthetic
+
+
+def wait_ready(base_url, process, timeout):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            if requests.get(f'{base_url}/readyz', timeout=1).status_code == 200:
+                return time.perf_counter() - start
+        except requests.ConnectionError:
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(f"not ready after {timeout} s")
+
+
+def logged_in_session(base_url, number):
+    session = requests.Session()
+    credentials = {'email': f'startup{number}@example.com', 'password': 'benchmark'}
+    session.post(f'{base_url}/auth/register', data=credentials)
+    session.post(f'{base_url}/auth/login', data=credentials)
+    return session
+
+
+def wave(base_url, sessions, pdfs):
+    def post(args):
+        session, pdf = args
+        start = time.perf_counter()
+        response = session.post(f'{base_url}/ats_score', files={'resume': ('resume.pdf', io.BytesIO(pdf))})
+        return (time.perf_counter() - start) * 1000, response.status_code
+    with ThreadPoolExecutor(len(sessions)) as pool:
+        return list(pool.map(post, zip(sessions, pdfs)))
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def pss_mb(pid):
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            if line.startswith('Pss:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def run(warmup, args, rng):
+    port = args.port
+    base_url = f'http://127.0.0.1:{port}'
+    env = dict(os.environ, WARMUP=warmup, WEB_CONCURRENCY=str(args.workers), BIND=f'127.0.0.1:{port}')
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], cwd=ROOT, env=env)
+    try:
+        ready_s = wait_ready(base_url, process, args.timeout)
+        sessions = [logged_in_session(base_url, i) for i in range(args.workers)]
+        first = wave(base_url, sessions, [synthetic.make_pdf(synthetic.make_resume(rng)) for _ in sessions])
+        warm = wave(base_url, sessions, [synthetic.make_pdf(synthetic.make_resume(rng)) for _ in sessions])
+        pids = [process.pid] + children(process.pid)
+        return {
+            'ready_s': ready_s,
+            'first_ms': [ms for ms, _ in first],
+            'warm_ms': [ms for ms, _ in warm],
+            'errors': sum(status != 200 for _, status in first + warm),
+            'pss_mb': sum(pss_mb(pid) for pid in pids),
+            'processes': len(pids),
+        }
+    finally:
+        process.terminate()
+        process.wait(30)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure start-up with and without the pre-fork warm-up.")
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--port', type=int, default=5051)
+    arg_parser.add_argument('--timeout', type=float, default=600)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--out', help="Write the results to this JSON file")
+    args = arg_parser.parse_args()
+    rng = synthetic.rng_for(args.seed)
+
+    results = {mode: run(warmup, args, rng) for mode, warmup in (('warmup', '1'), ('lazy', '0'))}
+    print(f"{args.workers} workers")
+    print(f"{'':>7} {'ready s':>8} {'first max ms':>13} {'first mean ms':>14} {'warm mean ms':>13} {'PSS MB':>8} {'errors':>7}")
+    for mode, r in results.items():
+        print(f"{mode:>7} {r['ready_s']:8.2f} {max(r['first_ms']):13.1f} {sum(r['first_ms']) / len(r['first_ms']):14.1f} "
+              f"{sum(r['warm_ms']) / len(r['warm_ms']):13.1f} {r['pss_mb']:8.1f} {r['errors']:7d}")
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
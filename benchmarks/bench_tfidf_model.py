@@ -0,0 +1,114 @@
+"""Benchmark: per-pair TF-IDF fits (TFIDF_MODE=pair) against the corpus model (corpus).
+
+Builds CorpusTfidf from a synthetic job dataset and reports:
+- equivalence: the batched pair scores (matcher.pairwise_tfidf_scores) against a
+  fresh two-document TfidfVectorizer per pair, which is what pair mode computes;
+- latency: scoring one pair and ranking a batch of resumes in each mode, and the
+  cost of counting a new JD in an update;
+- quality: how well each mode separates resumes written around a JD's skills from
+  resumes with other skills (AUC and mean score gap), and the rank correlation of
+  the two modes' scores.
+--history N first counts N other job descriptions, as updates of a deployed model do over time.
+Run from the project root:  python benchmarks/bench_tfidf_model.py [--rows 20000] [--history 500]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from scipy.stats import spearmanr
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+import synthetic
+from dataset import JobDataset
+from matcher import preprocess, pairwise_tfidf_scores
+from tfidf_model import CorpusTfidf
+
+
+def pair_score(resume_doc, job_doc):
+    # The original per-call fit in hybrid_match_score
+    tfidf = TfidfVectorizer(stop_words="english")
+    matrix = tfidf.fit_transform([resume_doc, job_doc])
+    return cosine_similarity(matrix[0:1], matrix[1:2])[0][0]
+
+
+def make_resume(rng, skills, count=300, skill_density=0.08):
+    return " ".join(synthetic.words(rng, count, skill_density, skills))
+
+
+def auc(positive, negative):
+    """Probability that a relevant resume outscores an irrelevant one."""
+    positive, negative = np.asarray(positive)[:, None], np.asarray(negative)[None, :]
+    return float((positive > negative).mean() + 0.5 * (positive == negative).mean())
+
+
+def timed_ms(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare pair and corpus TF-IDF scoring.")
+    arg_parser.add_argument('--rows', type=int, default=5000, help="Rows in the synthetic job dataset")
+    arg_parser.add_argument('--job-descs', type=int, default=20)
+    arg_parser.add_argument('--resumes', type=int, default=20, help="Relevant and irrelevant resumes per JD")
+    arg_parser.add_argument('--history', type=int, default=0, help="Job descriptions counted before scoring")
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+    rng = synthetic.rng_for(args.seed)
+
+    dataset = JobDataset.from_frame(synthetic.make_dataset(args.rows, rng), sha256='benchmark')
+    model, build_ms = timed_ms(CorpusTfidf.from_dataset, dataset)
+    print(f"corpus model: {args.rows} rows in {build_ms:.0f} ms, {model.df.nbytes / 1e6:.1f} MB of document counts")
+    model.add_documents([preprocess(synthetic.make_job_desc(rng)) for _ in range(args.history)])
+
+    max_diff = 0.0
+    pair_ms, corpus_ms, batch_pair_ms, batch_corpus_ms, count_ms = [], [], [], [], []
+    aucs = {'pair': [], 'corpus': []}
+    gaps = {'pair': [], 'corpus': []}
+    correlations = []
+    for _ in range(args.job_descs):
+        skills = rng.sample(synthetic.IT_SKILLS, 6)
+        others = [skill for skill in synthetic.IT_SKILLS if skill not in skills]
+        job_doc = preprocess(make_resume(rng, skills, count=150, skill_density=0.15))
+        relevant = [preprocess(make_resume(rng, skills)) for _ in range(args.resumes)]
+        irrelevant = [preprocess(make_resume(rng, others)) for _ in range(args.resumes)]
+        resume_docs = relevant + irrelevant
+
+        single = []
+        for doc in resume_docs:
+            score, ms = timed_ms(pair_score, doc, job_doc)
+            single.append(score)
+            pair_ms.append(ms)
+        batched, ms = timed_ms(pairwise_tfidf_scores, job_doc, resume_docs)
+        batch_pair_ms.append(ms)
+        max_diff = max(max_diff, float(np.abs(batched - single).max()))
+
+        for doc in resume_docs:
+            corpus_ms.append(timed_ms(model.similarities, job_doc, [doc])[1])
+        corpus, ms = timed_ms(model.similarities, job_doc, resume_docs)
+        batch_corpus_ms.append(ms)
+        # Counted after scoring, as the next update_tfidf_model does
+        _, ms = timed_ms(model.add_documents, [job_doc])
+        count_ms.append(ms)
+
+        for mode, scores in (('pair', batched), ('corpus', corpus)):
+            aucs[mode].append(auc(scores[:args.resumes], scores[args.resumes:]))
+            gaps[mode].append(float(scores[:args.resumes].mean() - scores[args.resumes:].mean()) * 100)
+        correlations.append(spearmanr(batched, corpus).correlation)
+
+    print(f"pair mode: batched scores vs per-pair fits, max |diff| {max_diff:.2e}")
+    print(f"{'':>8} {'pair ms':>9} {'batch ms':>9} {'AUC':>6} {'gap':>6}")
+    for mode, single_ms, batch_ms in (('pair', pair_ms, batch_pair_ms), ('corpus', corpus_ms, batch_corpus_ms)):
+        print(f"{mode:>8} {np.median(single_ms):9.3f} {np.median(batch_ms):9.3f} "
+              f"{np.mean(aucs[mode]):6.3f} {np.mean(gaps[mode]):6.2f}")
+    print(f"count one JD: {np.median(count_ms):.3f} ms; "
+          f"Spearman correlation of the modes' scores: {np.mean(correlations):.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Compare two benchmark result files written by run_suite.py.
+
+Prints p50/p99 latency and throughput for every benchmark in both files, with the
+relative change, and exits with status 1 if any p50 or p99 got slower than the
+threshold allows.
+Run from the project root:  python benchmarks/compare.py baseline.json current.json [--threshold 0.2]
+"""
+import argparse
+import json
+import sys
+
+
+def load_results(path):
+    with open(path) as f:
+        report = json.load(f)
+    results = {}
+    for group in ('components', 'e2e'):
+        for name, stats in report.get(group, {}).items():
+            results[f"{group}/{name}"] = stats
+    return results
+
+
+def change(old, new):
+    return (new - old) / old if old else 0.0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    arg_parser.add_argument('baseline')
+    arg_parser.add_argument('current')
+    arg_parser.add_argument('--threshold', type=float, default=0.2,
+                            help="Relative latency increase counted as a regression (default 0.2 = 20%%)")
+    args = arg_parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    regressions = []
+    print(f"{'benchmark':<32} {'p50 ms':>19} {'p99 ms':>19} {'throughput/s':>21}")
+    for name in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[name], current[name]
+        cells = []
+        for key in ('p50_ms', 'p99_ms', 'throughput_per_s'):
+            delta = change(old[key] or 0, new[key] or 0)
+            cells.append(f"{new[key] or 0:>10.2f} ({delta:+6.1%})")
+            if key != 'throughput_per_s' and delta > args.threshold:
+                regressions.append(f"{name} {key}")
+        print(f"{name:<32} {cells[0]:>19} {cells[1]:>19} {cells[2]:>21}")
+    for name in sorted(baseline.keys() ^ current.keys()):
+        print(f"{name:<32} only in {'baseline' if name in baseline else 'current'}")
+
+    if regressions:
+        print(f"\nRegressions over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
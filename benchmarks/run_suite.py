@@ -0,0 +1,213 @@
+"""Benchmark suite: per-component latency and an end-to-end Flask load test.
+
+Generates a synthetic job dataset, resumes, job descriptions and PDF/DOCX files,
+then reports throughput and p50/p99 latency for each component in isolation:
+  extract_pdf, extract_docx, analyze_formatting, analyze_skills, hybrid_match_score,
+  predict_job_title
+and, with --e2e, for POST /ats_score, /job_matcher and /job_predictor through the
+Flask test client, with MongoDB replaced by mongomock and learning-resource lookups
+by the stub backend. Every input is distinct, so the caches don't hide the work.
+
+Results are written as JSON (--out) for benchmarks/compare.py. Component and e2e
+runs need the spaCy and sentence-transformer models; e2e also needs mongomock.
+
+Run from the project root:
+  python benchmarks/run_suite.py --iterations 50 --pages 2 --e2e --out results.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import synthetic
+
+COMPONENTS = ['extract_pdf', 'extract_docx', 'analyze_formatting', 'analyze_skills',
+              'hybrid_match_score', 'predict_job_title']
+ENDPOINTS = ['ats_score', 'job_matcher', 'job_predictor']
+
+
+def summarize(durations, wall_time=None):
+    durations = np.asarray(durations)
+    wall_time = wall_time if wall_time is not None else float(durations.sum())
+    return {
+        'n': int(len(durations)),
+        'throughput_per_s': len(durations) / wall_time if wall_time else None,
+        'mean_ms': float(durations.mean() * 1000),
+        'p50_ms': float(np.percentile(durations, 50) * 1000),
+        'p99_ms': float(np.percentile(durations, 99) * 1000),
+        'max_ms': float(durations.max() * 1000),
+    }
+
+
+def measure(func, inputs):
+    durations = []
+    for args in inputs:
+        start = time.perf_counter()
+        func(*args)
+        durations.append(time.perf_counter() - start)
+    return summarize(durations)
+
+
+def setup_environment(workdir, dataset_rows, seed):
+    """Point the app's configuration at a synthetic dataset and local-only backends."""
+    data_path = os.path.join(workdir, 'data.csv')
+    synthetic.make_dataset(dataset_rows, synthetic.rng_for(seed)).to_csv(data_path, index=False)
+    os.environ.update({
+        'DATA_PATH': data_path,
+        'DATASET_CACHE_DIR': os.path.join(workdir, 'dataset_cache'),
+        'JOB_INDEX_PATH': os.path.join(workdir, 'job_index.joblib'),
+        'JOBS_DB_PATH': os.path.join(workdir, 'jobs.sqlite3'),
+        'RESOURCE_BACKEND': 'stub',
+        'CACHE_BACKEND': 'memory',
+        'SECRET_KEY': 'benchmark',
+    })
+
+
+def run_components(args, selected):
+    rng = synthetic.rng_for(args.seed + 1)
+    resumes = [synthetic.make_resume(rng, args.pages, args.skill_density) for _ in range(args.iterations)]
+    job_descs = [synthetic.make_job_desc(rng, args.jd_words) for _ in range(args.iterations)]
+    results = {}
+
+    if 'extract_pdf' in selected or 'extract_docx' in selected:
+        from ingest import extract_bytes
+        if 'extract_pdf' in selected:
+            files = [(synthetic.make_pdf(text), 'resume.pdf') for text in resumes]
+            results['extract_pdf'] = measure(extract_bytes, files)
+        if 'extract_docx' in selected:
+            files = [(synthetic.make_docx(text), 'resume.docx') for text in resumes]
+            results['extract_docx'] = measure(extract_bytes, files)
+
+    if 'analyze_formatting' in selected:
+        from ats_rules import analyze_formatting
+        results['analyze_formatting'] = measure(analyze_formatting, [(text, args.pages) for text in resumes])
+
+    if 'analyze_skills' in selected:
+        from ats_score import analyze_skills
+        results['analyze_skills'] = measure(analyze_skills, [(text,) for text in resumes])
+
+    if 'hybrid_match_score' in selected:
+        from matcher import hybrid_match_score
+        results['hybrid_match_score'] = measure(hybrid_match_score, list(zip(resumes, job_descs)))
+
+    if 'predict_job_title' in selected:
+        from job_predictor import predict_job_title, get_job_index
+        job_index = get_job_index()
+        results['predict_job_title'] = measure(predict_job_title, [(text, job_index) for text in resumes])
+
+    return results
+
+
+def run_e2e(args):
+    import mongomock
+    import db
+    db.init_db(mongomock.MongoClient())
+    from app import create_app
+    app = create_app()
+
+    rng = synthetic.rng_for(args.seed + 2)
+    results = {}
+    for endpoint in ENDPOINTS:
+        requests = []
+        for _ in range(args.iterations):
+            text = synthetic.make_resume(rng, args.pages, args.skill_density)
+            form = {'job_desc': synthetic.make_job_desc(rng, args.jd_words)} if endpoint == 'job_matcher' else {}
+            requests.append((synthetic.make_pdf(text), form))
+        results[endpoint] = load_test(app, f'/{endpoint}', requests, args.concurrency)
+    return results
+
+
+def load_test(app, path, requests, concurrency):
+    """Send ``requests`` from ``concurrency`` logged-in clients; any non-200 answer is counted as an error."""
+    spans = []
+    errors = []
+    lock = threading.Lock()
+    chunks = [requests[i::concurrency] for i in range(concurrency)]
+
+    def client_loop(number, chunk):
+        client = app.test_client()
+        credentials = {'email': f'bench{number}@example.com', 'password': 'benchmark'}
+        client.post('/auth/register', data=credentials)
+        client.post('/auth/login', data=credentials)
+        for pdf, form in chunk:
+            data = dict(form, resume=(io.BytesIO(pdf), 'resume.pdf'))
+            start = time.perf_counter()
+            response = client.post(path, data=data, content_type='multipart/form-data')
+            end = time.perf_counter()
+            with lock:
+                spans.append((start, end))
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+    threads = [threading.Thread(target=client_loop, args=(i, chunk)) for i, chunk in enumerate(chunks) if chunk]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Throughput over the requests themselves, leaving out each client's login
+    wall_time = max(end for _, end in spans) - min(start for start, _ in spans)
+    result = summarize([end - start for start, end in spans], wall_time)
+    result['errors'] = len(errors)
+    result['concurrency'] = concurrency
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+    except Exception:
+        return None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Run the scoring benchmark suite.")
+    arg_parser.add_argument('--components', default=','.join(COMPONENTS),
+                            help="Comma-separated components to time (empty for none)")
+    arg_parser.add_argument('--e2e', action='store_true', help="Also load-test the Flask endpoints")
+    arg_parser.add_argument('--iterations', type=int, default=30)
+    arg_parser.add_argument('--concurrency', type=int, default=4)
+    arg_parser.add_argument('--pages', type=int, default=1)
+    arg_parser.add_argument('--skill-density', type=float, default=0.08)
+    arg_parser.add_argument('--jd-words', type=int, default=200)
+    arg_parser.add_argument('--dataset-rows', type=int, default=2000)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--out', help="Write the results to this JSON file")
+    args = arg_parser.parse_args()
+    selected = [name for name in args.components.split(',') if name]
+    unknown = set(selected) - set(COMPONENTS)
+    if unknown:
+        arg_parser.error(f"unknown components: {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        setup_environment(workdir, args.dataset_rows, args.seed)
+        report = {
+            'meta': {
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'git_revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'args': vars(args),
+            },
+            'components': run_components(args, selected),
+            'e2e': run_e2e(args) if args.e2e else {},
+        }
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Synthetic resumes, job descriptions, documents and job datasets for the benchmarks.
+
+Everything is generated from a seeded ``random.Random`` so runs are reproducible.
+"""
+import io
+import random
+
+import pandas as pd
+from docx import Document
+
+IT_SKILLS = ("python java sql docker aws kubernetes spark airflow react node.js c++ excel tableau "
+             "tensorflow pytorch linux git jenkins terraform go scala hadoop django flask postgresql "
+             "mongodb redis kafka azure gcp pandas numpy").split()
+SOFT_SKILLS = ["communication", "teamwork", "leadership", "problem-solving", "adaptability"]
+FILLER = ("developed built designed deployed maintained improved reduced increased led managed the a "
+          "team service pipeline platform customers reports dashboards latency cost by using with for "
+          "across multiple projects data models systems analysis testing production features").split()
+TITLES = ["Data Engineer", "Backend Developer", "ML Engineer", "DevOps Engineer", "Data Analyst",
+          "Frontend Developer", "Cloud Architect", "QA Engineer", "Full Stack Developer", "SRE"]
+SECTIONS = ["Summary", "Experience", "Projects", "Education", "Skills", "Certifications"]
+MONTHS = "Jan Feb Mar Apr May Jun Jul Aug Sep Oct Nov Dec".split()
+
+WORDS_PER_PAGE = 450
+
+
+def words(rng, count, skill_density, skills=IT_SKILLS):
+    return [rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER) for _ in range(count)]
+
+
+def make_resume(rng, pages=1, skill_density=0.08, words_per_page=WORDS_PER_PAGE):
+    """A resume of roughly ``pages`` pages with section headings, dated roles and bullets."""
+    budget = pages * words_per_page
+    lines = ["Jane Doe", "jane.doe@example.com | +1 555 0100", ""]
+    while budget > 0:
+        for section in SECTIONS:
+            lines += [section.upper(), ""]
+            if section == "Experience":
+                start = rng.randint(2010, 2020)
+                lines.append(f"{rng.choice(TITLES)}, Example Corp ({rng.choice(MONTHS)} {start} - "
+                             f"{rng.choice(MONTHS)} {start + rng.randint(1, 4)})")
+            elif section == "Education":
+                lines.append(f"B.Tech in Computer Science, Example University, {rng.randint(2008, 2018)}, GPA 8.{rng.randint(0, 9)}")
+            elif section == "Certifications":
+                lines.append(f"AWS Certified {rng.choice(['Developer', 'Solutions Architect'])}, {rng.randint(2018, 2024)}")
+            for _ in range(rng.randint(3, 6)):
+                count = rng.randint(10, 20)
+                lines.append("- " + " ".join(words(rng, count, skill_density)).capitalize() + ".")
+                budget -= count
+            lines.append("")
+            if budget <= 0:
+                break
+    return "\n".join(lines)
+
+
+def make_job_desc(rng, words_count=200, skill_density=0.12):
+    sentences = []
+    while words_count > 0:
+        count = rng.randint(8, 18)
+        sentences.append(" ".join(words(rng, count, skill_density)).capitalize() + ".")
+        words_count -= count
+    return f"{rng.choice(TITLES)}\n" + "\n".join(sentences)
+
+
+def make_dataset(rows, rng):
+    return pd.DataFrame({
+        "Job Title": [rng.choice(TITLES) for _ in range(rows)],
+        "IT Skills": [", ".join(rng.sample(IT_SKILLS, rng.randint(3, 8))) for _ in range(rows)],
+        "Soft Skills": [", ".join(rng.sample(SOFT_SKILLS, 2)) for _ in range(rows)],
+    })
+
+
+def wrap(text, width=90):
+    for paragraph in text.split("\n"):
+        line = ""
+        for word in paragraph.split():
+            if line and len(line) + 1 + len(word) > width:
+                yield line
+                line = word
+            else:
+                line = f"{line} {word}" if line else word
+        yield line
+
+
+def make_pdf(text, lines_per_page=55):
+    """A minimal PDF (Helvetica, one text object per page) that PyPDF2 can extract."""
+    lines = list(wrap(text))
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None,
+               "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for page_lines in pages:
+        escaped = [line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in page_lines]
+        stream = "BT /F1 10 Tf 13 TL 50 750 Td " + " ".join(f"({line}) Tj T*" for line in escaped) + " ET"
+        stream = stream.encode('latin-1', 'replace')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode())
+        out.write(body if isinstance(body, bytes) else body.encode('latin-1'))
+        out.write(b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def make_docx(text):
+    document = Document()
+    for paragraph in text.split("\n"):
+        document.add_paragraph(paragraph)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def rng_for(seed):
+    return random.Random(seed)
@@ -0,0 +1,142 @@
+import atexit
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'memory')
+
+# The process whose exit-time saves are skipped: gunicorn's master, which exits after
+# its workers and would overwrite what they saved with its pre-fork copy.
+_skip_saves_pid = None
+
+
+def normalize_text(text):
+    return (text or "").replace('\r\n', '\n').replace('\r', '\n').strip()
+
+
+def content_hash(*parts):
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(normalize_text(part).encode('utf-8'))
+        digest.update(b'\x00')
+    return digest.hexdigest()
+
+
+def save_at_exit(save, *args):
+    """``atexit.register(save, *args)``, except in a process that called skip_saves_at_exit.
+
+    Forked workers inherit the registration and still save.
+    """
+    def save_unless_skipped():
+        if os.getpid() != _skip_saves_pid:
+            save(*args)
+    atexit.register(save_unless_skipped)
+
+
+def skip_saves_at_exit():
+    global _skip_saves_pid
+    _skip_saves_pid = os.getpid()
+
+
+class MemoryCache:
+    """In-process LRU with a per-entry TTL."""
+
+    def __init__(self, maxsize=1024, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class MongoCache:
+    """Cache shared by all workers, stored in a MongoDB collection.
+
+    A TTL index removes expired documents; ``maxsize`` is enforced by the
+    collection's document count, trimming the oldest entries on write.
+    ``get_collection`` is called on every use so a forked worker talks to
+    the database through its own client.
+    """
+
+    def __init__(self, get_collection, maxsize=100000, ttl=3600):
+        self.get_collection = get_collection
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._indexed = False
+
+    @property
+    def collection(self):
+        collection = self.get_collection()
+        if not self._indexed:
+            collection.create_index('expires_at', expireAfterSeconds=0)
+            collection.create_index('created_at')
+            self._indexed = True
+        return collection
+
+    def get(self, key):
+        now = datetime.now(timezone.utc)
+        doc = self.collection.find_one({'_id': key, 'expires_at': {'$gt': now}}, {'value': 1})
+        return doc['value'] if doc else None
+
+    def get_many(self, keys):
+        """``get`` for each of ``keys``, in one query."""
+        now = datetime.now(timezone.utc)
+        found = {doc['_id']: doc['value']
+                 for doc in self.collection.find({'_id': {'$in': list(set(keys))}, 'expires_at': {'$gt': now}},
+                                                 {'value': 1})}
+        return [found.get(key) for key in keys]
+
+    def set(self, key, value):
+        now = datetime.now(timezone.utc)
+        collection = self.collection
+        collection.replace_one(
+            {'_id': key},
+            {'value': value, 'created_at': now, 'expires_at': now + timedelta(seconds=self.ttl)},
+            upsert=True
+        )
+        overflow = collection.estimated_document_count() - self.maxsize
+        if overflow > 0:
+            oldest = collection.find({}, {'_id': 1}).sort('created_at', 1).limit(overflow)
+            collection.delete_many({'_id': {'$in': [doc['_id'] for doc in oldest]}})
+
+    def clear(self):
+        self.collection.delete_many({})
+
+
+def make_cache(name, get_db=None, maxsize=1024, ttl=3600, backend=CACHE_BACKEND):
+    """Build the configured cache backend; the mongo backend stores it in collection ``name``."""
+    if backend == 'mongo':
+        if get_db is None:
+            raise ValueError("The mongo cache backend needs a database")
+        return MongoCache(lambda: get_db()[name], maxsize=maxsize, ttl=ttl)
+    if backend == 'memory':
+        return MemoryCache(maxsize=maxsize, ttl=ttl)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,49 @@
+import os
+from dotenv import load_dotenv
+
+# Before the modules below read their own defaults from the environment
+load_dotenv()
+
+import dataset
+import embedding_backends
+import job_index
+import nlp_runtime
+import tfidf_model
+import uploads
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class Config:
+    """Default settings for create_app; each can be overridden by the ``config`` it is given."""
+
+    SECRET_KEY = os.getenv('SECRET_KEY')
+    DATA_PATH = dataset.DATA_PATH
+    DATASET_CACHE_DIR = dataset.DATASET_CACHE_DIR
+    JOB_INDEX_PATH = job_index.JOB_INDEX_PATH
+    TFIDF_MODEL_PATH = tfidf_model.TFIDF_MODEL_PATH
+    SPACY_MODEL = nlp_runtime.SPACY_MODEL
+    SENTENCE_MODEL = embedding_backends.SENTENCE_MODEL
+    EMBEDDING_BACKEND = embedding_backends.EMBEDDING_BACKEND
+    EMBEDDING_ONNX_DIR = embedding_backends.EMBEDDING_ONNX_DIR
+    MAX_CONTENT_LENGTH = uploads.MAX_CONTENT_LENGTH
+    # The HTML templates are checked in next to the modules unless there is a templates/ directory
+    TEMPLATE_FOLDER = 'templates' if os.path.isdir(os.path.join(ROOT, 'templates')) else ROOT
+    # Load models and indexes and run a dummy inference in create_app, rather than on first use
+    WARMUP = os.getenv('WARMUP', '1') == '1'
+
+
+def apply_config(config):
+    """Point the dataset and model loaders at the configured paths.
+
+    The loaders read these module settings when they first run, so this has to happen
+    before anything is loaded.
+    """
+    dataset.DATA_PATH = config['DATA_PATH']
+    dataset.DATASET_CACHE_DIR = config['DATASET_CACHE_DIR']
+    job_index.JOB_INDEX_PATH = config['JOB_INDEX_PATH']
+    tfidf_model.TFIDF_MODEL_PATH = config['TFIDF_MODEL_PATH']
+    nlp_runtime.SPACY_MODEL = config['SPACY_MODEL']
+    nlp_runtime.EMBEDDING_BACKEND = config['EMBEDDING_BACKEND']
+    embedding_backends.SENTENCE_MODEL = config['SENTENCE_MODEL']
+    embedding_backends.EMBEDDING_ONNX_DIR = config['EMBEDDING_ONNX_DIR']
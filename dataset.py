@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+
+DATA_PATH = os.getenv('DATA_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data.csv'))
+DATASET_CACHE_DIR = os.getenv('DATASET_CACHE_DIR', 'dataset_cache')
+FORMAT_VERSION = 1
+
+COLUMNS = ["Job Title", "IT Skills", "Soft Skills"]
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_job_csv(path):
+    try:
+        df = pd.read_csv(path, usecols=COLUMNS, dtype=str)
+    except UnicodeDecodeError:
+        df = pd.read_csv(path, usecols=COLUMNS, dtype=str, encoding="ISO-8859-1")
+    return df.fillna("")
+
+
+def split_skills(text):
+    return [skill.strip().lower() for skill in text.split(",") if skill.strip()]
+
+
+class StringColumn:
+    """Read-only strings stored as one UTF-8 buffer plus offsets; decoded on access."""
+
+    def __init__(self, data, offsets):
+        self.data = data
+        self.offsets = offsets
+
+    @classmethod
+    def from_strings(cls, strings):
+        encoded = [s.encode('utf-8') for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.data[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def tolist(self):
+        return list(self)
+
+
+class TokenColumn:
+    """Per-row arrays of interned token ids, stored CSR-style as ids plus row offsets."""
+
+    def __init__(self, ids, offsets):
+        self.ids = ids
+        self.offsets = offsets
+
+    @classmethod
+    def from_rows(cls, rows):
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows], out=offsets[1:])
+        ids = np.fromiter((token for row in rows for token in row), dtype=np.int32, count=offsets[-1])
+        return cls(ids, offsets)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+
+class JobDataset:
+    """The job titles and skill columns of data.csv in a compact, read-only form.
+
+    ``IT Skills`` and ``Soft Skills`` are split on commas, normalised (stripped,
+    lower-cased) and interned into one shared vocabulary. Everything is stored as
+    flat NumPy arrays, so a cached copy can be memory-mapped and its pages shared
+    by all worker processes.
+    """
+
+    ARRAYS = ('title_data', 'title_offsets', 'it_data', 'it_offsets', 'soft_data', 'soft_offsets',
+              'vocab_data', 'vocab_offsets', 'it_ids', 'it_id_offsets', 'soft_ids', 'soft_id_offsets')
+
+    def __init__(self, titles, it_text, soft_text, vocab, it_tokens, soft_tokens, sha256):
+        self.titles = titles
+        self.it_text = it_text
+        self.soft_text = soft_text
+        self.vocab = vocab
+        self.it_tokens = it_tokens
+        self.soft_tokens = soft_tokens
+        self.sha256 = sha256
+
+    @classmethod
+    def from_frame(cls, df, sha256=None):
+        vocab = {}
+        it_rows = [[vocab.setdefault(skill, len(vocab)) for skill in split_skills(text)] for text in df["IT Skills"]]
+        soft_rows = [[vocab.setdefault(skill, len(vocab)) for skill in split_skills(text)] for text in df["Soft Skills"]]
+        return cls(StringColumn.from_strings(df["Job Title"].str.strip()),
+                   StringColumn.from_strings(df["IT Skills"]),
+                   StringColumn.from_strings(df["Soft Skills"]),
+                   StringColumn.from_strings(vocab),
+                   TokenColumn.from_rows(it_rows),
+                   TokenColumn.from_rows(soft_rows),
+                   sha256)
+
+    @classmethod
+    def from_csv(cls, path):
+        return cls.from_frame(read_job_csv(path), file_sha256(path))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def _arrays(self):
+        columns = (self.titles, self.it_text, self.soft_text, self.vocab)
+        arrays = [a for column in columns for a in (column.data, column.offsets)]
+        arrays += [self.it_tokens.ids, self.it_tokens.offsets, self.soft_tokens.ids, self.soft_tokens.offsets]
+        return dict(zip(self.ARRAYS, arrays))
+
+    def save(self, directory):
+        os.makedirs(directory)
+        for name, array in self._arrays().items():
+            np.save(os.path.join(directory, name + '.npy'), array)
+
+    @classmethod
+    def load(cls, directory, sha256, mmap_mode='r'):
+        a = {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode) for name in cls.ARRAYS}
+        return cls(StringColumn(a['title_data'], a['title_offsets']),
+                   StringColumn(a['it_data'], a['it_offsets']),
+                   StringColumn(a['soft_data'], a['soft_offsets']),
+                   StringColumn(a['vocab_data'], a['vocab_offsets']),
+                   TokenColumn(a['it_ids'], a['it_id_offsets']),
+                   TokenColumn(a['soft_ids'], a['soft_id_offsets']),
+                   sha256)
+
+    def it_skills(self, i):
+        return [self.vocab[token] for token in self.it_tokens[i]]
+
+    def soft_skills(self, i):
+        return [self.vocab[token] for token in self.soft_tokens[i]]
+
+    def it_skill_vocabulary(self):
+        return [self.vocab[token] for token in np.unique(self.it_tokens.ids)]
+
+    def skill_texts(self):
+        """"<IT Skills> <Soft Skills>" for every row: the text the job index is built from."""
+        return [f"{it} {soft}" for it, soft in zip(self.it_text, self.soft_text)]
+
+
+def _source_state(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'mtime': stat.st_mtime, 'size': stat.st_size, 'version': FORMAT_VERSION}
+
+
+def load_dataset(path=DATA_PATH, cache_dir=DATASET_CACHE_DIR):
+    """Load data.csv through an on-disk cache keyed on the file's mtime and SHA-256.
+
+    An unchanged mtime and size reuse the cache without reading the CSV. Otherwise
+    the CSV is hashed, and only parsed again if its content actually changed.
+    """
+    if not cache_dir:
+        return JobDataset.from_csv(path)
+
+    state = _source_state(path)
+    state_path = os.path.join(cache_dir, 'source.json')
+    try:
+        with open(state_path) as f:
+            cached_state = json.load(f)
+    except (OSError, ValueError):
+        cached_state = {}
+
+    if {k: cached_state.get(k) for k in state} == state:
+        sha256 = cached_state['sha256']
+    else:
+        sha256 = file_sha256(path)
+    directory = os.path.join(cache_dir, f'{sha256[:16]}-v{FORMAT_VERSION}')
+
+    if os.path.isdir(directory):
+        try:
+            dataset = JobDataset.load(directory, sha256)
+        except Exception as e:
+            print(f"Error loading dataset cache from {directory}: {e}")
+            dataset = None
+    else:
+        dataset = None
+
+    if dataset is None:
+        dataset = JobDataset.from_frame(read_job_csv(path), sha256)
+        try:
+            _write_cache(dataset, cache_dir, directory)
+            dataset = JobDataset.load(directory, sha256)
+        except Exception as e:
+            print(f"Error saving dataset cache to {directory}: {e}")
+
+    if cached_state.get('sha256') != sha256 or cached_state.get('mtime') != state['mtime']:
+        try:
+            _write_state(state_path, dict(state, sha256=sha256))
+        except Exception as e:
+            print(f"Error saving dataset cache state to {state_path}: {e}")
+    return dataset
+
+
+def _write_cache(dataset, cache_dir, directory):
+    # Build the copy under a temporary name and rename it into place, so another worker
+    # never maps a half-written cache; older copies are removed afterwards.
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_dir = f'{directory}.{os.getpid()}.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    dataset.save(tmp_dir)
+    try:
+        os.rename(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if not os.path.isdir(directory):
+            raise
+    for name in os.listdir(cache_dir):
+        entry = os.path.join(cache_dir, name)
+        if entry != directory and os.path.isdir(entry) and not name.endswith('.tmp'):
+            shutil.rmtree(entry, ignore_errors=True)
+
+
+def _write_state(state_path, state):
+    tmp_path = f'{state_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f)
+    os.replace(tmp_path, state_path)
+
+
+_lock = threading.Lock()
+_datasets = {}
+
+
+def get_dataset(path=None):
+    """The process-wide read-only dataset for ``path`` (default DATA_PATH), shared by every blueprint."""
+    path = path or DATA_PATH
+    if path not in _datasets:
+        with _lock:
+            if path not in _datasets:
+                _datasets[path] = load_dataset(path, DATASET_CACHE_DIR)
+    return _datasets[path]
@@ -0,0 +1,92 @@
+import os
+import threading
+from dotenv import load_dotenv
+from pymongo import MongoClient
+import submissions
+
+load_dotenv()
+
+MONGO_URI = os.getenv('MONGO_URI')
+MONGO_DB = os.getenv('MONGO_DB', 'job_portal')
+MONGO_MAX_POOL_SIZE = int(os.getenv('MONGO_MAX_POOL_SIZE', '20'))
+MONGO_TIMEOUT_MS = int(os.getenv('MONGO_TIMEOUT_MS', '5000'))
+MONGO_WRITE_CONCERN = os.getenv('MONGO_WRITE_CONCERN', '1')
+
+_lock = threading.Lock()
+_client = None
+_client_pid = None
+
+
+def _write_concern():
+    return int(MONGO_WRITE_CONCERN) if MONGO_WRITE_CONCERN.isdigit() else MONGO_WRITE_CONCERN
+
+
+def get_client():
+    """The process-wide MongoClient (one connection pool per worker)."""
+    global _client, _client_pid
+    # MongoClient isn't fork-safe: a forked worker gets its own client on first use.
+    if _client is None or _client_pid != os.getpid():
+        with _lock:
+            if _client is None or _client_pid != os.getpid():
+                _client = MongoClient(
+                    MONGO_URI,
+                    maxPoolSize=MONGO_MAX_POOL_SIZE,
+                    serverSelectionTimeoutMS=MONGO_TIMEOUT_MS,
+                    connectTimeoutMS=MONGO_TIMEOUT_MS,
+                    socketTimeoutMS=MONGO_TIMEOUT_MS * 6,
+                    w=_write_concern(),
+                    connect=False
+                )
+                _client_pid = os.getpid()
+    return _client
+
+
+def init_db(client=None):
+    """Use ``client`` (e.g. a mongomock.MongoClient in tests) instead of the configured one."""
+    global _client, _client_pid
+    with _lock:
+        _client = client
+        _client_pid = os.getpid() if client is not None else None
+    submissions.ensure_indexes(get_db())
+
+
+def get_db():
+    return get_client()[MONGO_DB]
+
+
+class UserRepository:
+    """User and submission operations used by the blueprints."""
+
+    def __init__(self, db):
+        self.db = db
+        self.users = db.users
+
+    def exists(self, email):
+        return self.users.find_one({'email': email}, {'_id': 1}) is not None
+
+    def get_password_hash(self, email):
+        user = self.users.find_one({'email': email}, {'password': 1})
+        return user.get('password') if user else None
+
+    def create_user(self, email, password_hash):
+        self.users.insert_one({'email': email, 'password': password_hash, 'resume_text': None})
+
+    def has_resume(self, email):
+        return self.users.find_one({'email': email, 'resume_text': {'$nin': [None, '']}}, {'_id': 1}) is not None
+
+    def get_resume(self, email):
+        user = self.users.find_one({'email': email}, {'resume_text': 1})
+        return user.get('resume_text') if user else None
+
+    def update_resume(self, email, resume_text):
+        self.users.update_one({'email': email}, {'$set': {'resume_text': resume_text}}, upsert=True)
+
+    def append_submission(self, email, filename, resume_text, module, output):
+        return submissions.record_submission(self.db, email, filename, resume_text, module, output)
+
+    def history(self, email, page=1, per_page=20, module=None):
+        return submissions.get_history(self.db, email, page, per_page, module)
+
+
+def user_repository():
+    return UserRepository(get_db())
@@ -0,0 +1,97 @@
+import hashlib
+import os
+from functools import cached_property
+import nlp_runtime
+from cache import make_cache
+from db import get_db
+
+NOUN_POS = ("NOUN", "PROPN")
+
+
+class DocAnalysis:
+    """Views of one spaCy ``Doc``, each derived on first use and then kept.
+
+    Scorers take what they need from the same analysis instead of parsing the
+    text again.
+    """
+
+    def __init__(self, doc):
+        self.doc = doc
+
+    @classmethod
+    def parse(cls, text, disable=nlp_runtime.FULL):
+        return cls(nlp_runtime.parse(text, disable))
+
+    @classmethod
+    def parse_many(cls, texts, disable=nlp_runtime.FULL):
+        return [cls(doc) for doc in nlp_runtime.parse_many(texts, disable)]
+
+    @cached_property
+    def tokens(self):
+        return list(self.doc)
+
+    @cached_property
+    def noun_chunks(self):
+        return [chunk.text for chunk in self.doc.noun_chunks]
+
+    @cached_property
+    def lemmas(self):
+        return [token.lemma_ for token in self.tokens]
+
+    @cached_property
+    def entities(self):
+        return [(ent.text, ent.label_) for ent in self.doc.ents]
+
+    @cached_property
+    def sentences(self):
+        return [sent.text for sent in self.doc.sents]
+
+    @cached_property
+    def nouns(self):
+        """(text, lemma) of every noun and proper noun that isn't a stop word."""
+        return [(token.text, token.lemma_) for token in self.tokens if token.pos_ in NOUN_POS and not token.is_stop]
+
+
+class PhraseAnalysis:
+    """Noun chunks and nouns of one lower-cased text, parsed whole.
+
+    This is what the key-phrase extractors in matcher and job_matcher work from.
+    """
+
+    def __init__(self, features):
+        self.noun_chunks = features['noun_chunks']
+        self.nouns = [tuple(noun) for noun in features['nouns']]
+
+
+def phrase_features(texts):
+    return [{'noun_chunks': analysis.noun_chunks, 'nouns': analysis.nouns}
+            for analysis in DocAnalysis.parse_many(texts, nlp_runtime.PHRASES)]
+
+
+# Phrase features by exact text, so the scorers of one request and repeat submissions
+# share one parse. This is a content cache: an edited text is parsed again in full.
+phrase_cache = make_cache('phrase_cache', get_db,
+                          maxsize=int(os.getenv('PHRASE_CACHE_SIZE', '256')),
+                          ttl=int(os.getenv('PHRASE_CACHE_TTL', '86400')))
+
+
+def phrase_key(text):
+    # Unlike content_hash, whitespace counts: spaCy sees it
+    return hashlib.sha256(f'{nlp_runtime.SPACY_MODEL}\x00{text}'.encode('utf-8')).hexdigest()
+
+
+def analyze_phrases(text):
+    return analyze_phrases_many([text])[0]
+
+
+def analyze_phrases_many(texts):
+    """analyze_phrases for several texts, parsing the uncached ones in one batch."""
+    texts = [text.lower() for text in texts]
+    features = phrase_cache.get_many([phrase_key(text) for text in texts])
+    missing = list({text: None for text, found in zip(texts, features) if found is None})
+    if missing:
+        parsed = dict(zip(missing, phrase_features(missing)))
+        for text, found in parsed.items():
+            phrase_cache.set(phrase_key(text), found)
+        features = [found if found is not None else parsed[text] for text, found in zip(texts, features)]
+    return [PhraseAnalysis(found) for found in features]
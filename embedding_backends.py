@@ -0,0 +1,174 @@
+"""Inference backends for the sentence-embedding model.
+
+EMBEDDING_BACKEND selects how sentences are encoded:
+  torch  the stock SentenceTransformer model (float32)
+  int8   the same model with its Linear layers dynamically quantized to int8
+  onnx   an ONNX Runtime session over a model exported with
+         ``python embedding_backends.py export <dir> [--quantize]`` (needs onnxruntime)
+
+SENTENCE_MODEL may be a local directory, and the onnx backend reads only
+EMBEDDING_ONNX_DIR. Every backend runs on EMBEDDING_THREADS intra-op threads, by
+default the cores divided between the gunicorn workers so they don't oversubscribe
+the machine.
+"""
+import argparse
+import json
+import os
+
+import numpy as np
+
+SENTENCE_MODEL = os.getenv('SENTENCE_MODEL', 'all-MiniLM-L6-v2')
+EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch')
+EMBEDDING_ONNX_DIR = os.getenv('EMBEDDING_ONNX_DIR', 'models/minilm-onnx')
+EMBEDDING_ONNX_FILE = os.getenv('EMBEDDING_ONNX_FILE', 'model.onnx')
+# Same default as gunicorn.conf.py's worker count
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '2'))
+EMBEDDING_THREADS = int(os.getenv('EMBEDDING_THREADS', '0')) or max(1, (os.cpu_count() or 1) // WEB_CONCURRENCY)
+
+ONNX_CONFIG = 'embedding_config.json'
+ONNX_INT8_FILE = 'model_int8.onnx'
+
+
+def set_torch_threads(threads):
+    import torch
+    torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:  # only allowed before the first parallel op
+        pass
+
+
+def load_torch(threads=EMBEDDING_THREADS):
+    from sentence_transformers import SentenceTransformer
+    set_torch_threads(threads)
+    return SentenceTransformer(SENTENCE_MODEL, device='cpu')
+
+
+def load_int8(threads=EMBEDDING_THREADS):
+    import torch
+    model = load_torch(threads)
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class OnnxEncoder:
+    """Tokenizer, ONNX transformer and mean pooling with SentenceTransformer's ``encode`` interface."""
+
+    def __init__(self, model_dir=EMBEDDING_ONNX_DIR, model_file=EMBEDDING_ONNX_FILE, threads=EMBEDDING_THREADS):
+        import onnxruntime
+        from tokenizers import Tokenizer
+        with open(os.path.join(model_dir, ONNX_CONFIG)) as f:
+            self.config = json.load(f)
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, 'tokenizer.json'))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=self.config.get('pad_id', 0), pad_token=self.config.get('pad_token', '[PAD]'))
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = onnxruntime.InferenceSession(os.path.join(model_dir, model_file), options,
+                                                    providers=['CPUExecutionProvider'])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self):
+        return self.config['dimension']
+
+    def encode(self, sentences, convert_to_numpy=True, batch_size=64):
+        batches = [self._encode_batch(sentences[i:i + batch_size]) for i in range(0, len(sentences), batch_size)]
+        if not batches:
+            return np.empty((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+        return np.vstack(batches)
+
+    def _encode_batch(self, sentences):
+        encodings = self.tokenizer.encode_batch(sentences)
+        inputs = {
+            'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+            'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        hidden = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        # Mean over the real tokens, as the model's Pooling module does
+        mask = inputs['attention_mask'][:, :, None].astype(np.float32)
+        embeddings = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.config.get('normalize'):
+            embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        return embeddings.astype(np.float32)
+
+
+def load_onnx(threads=EMBEDDING_THREADS):
+    return OnnxEncoder(EMBEDDING_ONNX_DIR, EMBEDDING_ONNX_FILE, threads)
+
+
+BACKENDS = {
+    'torch': load_torch,
+    'int8': load_int8,
+    'onnx': load_onnx,
+}
+
+
+def load_embedding_model(backend=EMBEDDING_BACKEND, threads=EMBEDDING_THREADS):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {backend}")
+    return BACKENDS[backend](threads)
+
+
+def export_onnx(out_dir, quantize=False):
+    """Export SENTENCE_MODEL's transformer to ``out_dir`` for the onnx backend."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from sentence_transformers.models import Normalize
+
+    model = SentenceTransformer(SENTENCE_MODEL, device='cpu')
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    os.makedirs(out_dir, exist_ok=True)
+    tokenizer.save_pretrained(out_dir)
+
+    class Encoder(torch.nn.Module):
+        def __init__(self):
+            super().__init__()
+            self.transformer = transformer
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.transformer(input_ids=input_ids, attention_mask=attention_mask,
+                                    token_type_ids=token_type_ids)[0]
+
+    sample = tokenizer(["an example sentence"], return_tensors='pt')
+    names = ['input_ids', 'attention_mask', 'token_type_ids']
+    dynamic = {'batch': 0, 'tokens': 1}
+    with torch.no_grad():
+        torch.onnx.export(Encoder(), tuple(sample[name] for name in names), os.path.join(out_dir, 'model.onnx'),
+                          input_names=names, output_names=['last_hidden_state'],
+                          dynamic_axes={name: dynamic for name in names + ['last_hidden_state']},
+                          opset_version=14)
+
+    config = {
+        'model': SENTENCE_MODEL,
+        'dimension': model.get_sentence_embedding_dimension(),
+        'max_seq_length': model.max_seq_length,
+        'normalize': any(isinstance(module, Normalize) for module in model),
+        'pad_id': tokenizer.pad_token_id,
+        'pad_token': tokenizer.pad_token,
+    }
+    with open(os.path.join(out_dir, ONNX_CONFIG), 'w') as f:
+        json.dump(config, f, indent=2)
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(os.path.join(out_dir, 'model.onnx'), os.path.join(out_dir, ONNX_INT8_FILE),
+                         weight_type=QuantType.QInt8)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Embedding model utilities.")
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help="Export SENTENCE_MODEL to ONNX for EMBEDDING_BACKEND=onnx")
+    export.add_argument('out_dir', nargs='?', default=EMBEDDING_ONNX_DIR)
+    export.add_argument('--quantize', action='store_true', help=f"Also write an int8 copy as {ONNX_INT8_FILE}")
+    args = arg_parser.parse_args()
+    export_onnx(args.out_dir, args.quantize)
+    print(f"Exported {SENTENCE_MODEL} to {args.out_dir}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import numpy as np
+from metrics import timed
+
+EMBEDDING_CACHE_SIZE = int(os.getenv('EMBEDDING_CACHE_SIZE', '50000'))
+EMBEDDING_CACHE_PATH = os.getenv('EMBEDDING_CACHE_PATH')
+EMBEDDING_BATCH_WAIT = float(os.getenv('EMBEDDING_BATCH_WAIT', '0.005'))
+EMBEDDING_MAX_BATCH = int(os.getenv('EMBEDDING_MAX_BATCH', '256'))
+
+
+def sentence_key(sentence):
+    return hashlib.sha256(sentence.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """Bounded LRU of sentence vectors keyed by a SHA-256 of the sentence."""
+
+    def __init__(self, maxsize=EMBEDDING_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._vectors)
+
+    def get(self, key):
+        with self._lock:
+            vector = self._vectors.get(key)
+            if vector is not None:
+                self._vectors.move_to_end(key)
+            return vector
+
+    def put(self, key, vector):
+        with self._lock:
+            self._vectors[key] = vector
+            self._vectors.move_to_end(key)
+            while len(self._vectors) > self.maxsize:
+                self._vectors.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._vectors.clear()
+
+    def save(self, path):
+        with self._lock:
+            keys = list(self._vectors)
+            vectors = [self._vectors[key] for key in keys]
+        if not keys:
+            return
+        # Write next to the target and rename, so vectors still mapped from the old file stay valid.
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        matrix = np.lib.format.open_memmap(tmp_path + '.npy', mode='w+', dtype=np.float32,
+                                           shape=(len(keys), len(vectors[0])))
+        for i, vector in enumerate(vectors):
+            matrix[i] = vector
+        matrix.flush()
+        del matrix
+        with open(tmp_path + '.keys.json', 'w') as f:
+            json.dump(keys, f)
+        os.replace(tmp_path + '.npy', path + '.npy')
+        os.replace(tmp_path + '.keys.json', path + '.keys.json')
+
+    def load(self, path):
+        if not (os.path.exists(path + '.npy') and os.path.exists(path + '.keys.json')):
+            return
+        with open(path + '.keys.json') as f:
+            keys = json.load(f)
+        # Rows stay memory-mapped until they are read, so a large cache costs little to reopen.
+        matrix = np.load(path + '.npy', mmap_mode='r')
+        for i, key in enumerate(keys[-self.maxsize:], start=max(len(keys) - self.maxsize, 0)):
+            self.put(key, matrix[i])
+
+
+class EmbeddingService:
+    """Sentence embeddings with a shared cache and cross-request batching.
+
+    Cache misses from concurrent callers are collected for up to ``batch_wait``
+    seconds and encoded together in one ``model.encode`` call.
+    """
+
+    def __init__(self, model, cache=None, batch_wait=EMBEDDING_BATCH_WAIT, max_batch=EMBEDDING_MAX_BATCH):
+        self.model = model
+        self.cache = cache if cache is not None else EmbeddingCache()
+        self.batch_wait = batch_wait
+        self.max_batch = max_batch
+        self._pending = []
+        self._cond = threading.Condition()
+        self._worker = None
+
+    @timed('embedding')
+    def encode(self, sentences):
+        keys = [sentence_key(sentence) for sentence in sentences]
+        vectors = [self.cache.get(key) for key in keys]
+        missing = {}
+        for sentence, key, vector in zip(sentences, keys, vectors):
+            if vector is None:
+                missing.setdefault(key, sentence)
+
+        if missing:
+            future = self._submit(list(missing.values()))
+            for key, vector in zip(missing, future.result()):
+                self.cache.put(key, vector)
+                missing[key] = vector
+            vectors = [vector if vector is not None else missing[key] for key, vector in zip(keys, vectors)]
+
+        if not vectors:
+            return np.empty((0, self.dimension()), dtype=np.float32)
+        return np.vstack(vectors)
+
+    def dimension(self):
+        return self.model.get_sentence_embedding_dimension()
+
+    def _submit(self, sentences):
+        future = Future()
+        with self._cond:
+            self._pending.append((sentences, future))
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='embedding-batcher', daemon=True)
+                self._worker.start()
+            self._cond.notify()
+        return future
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                # Give concurrent requests a moment to join this batch.
+                self._cond.wait_for(lambda: sum(len(s) for s, _ in self._pending) >= self.max_batch,
+                                    timeout=self.batch_wait)
+                batch, self._pending = self._pending, []
+
+            unique = list(dict.fromkeys(sentence for sentences, _ in batch for sentence in sentences))
+            try:
+                encoded = self.model.encode(unique, convert_to_numpy=True, batch_size=64)
+                by_sentence = {sentence: np.asarray(vector, dtype=np.float32) for sentence, vector in zip(unique, encoded)}
+                for sentences, future in batch:
+                    future.set_result([by_sentence[sentence] for sentence in sentences])
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+
+    def save(self, path=EMBEDDING_CACHE_PATH):
+        if path:
+            self.cache.save(path)
+
+    def load(self, path=EMBEDDING_CACHE_PATH):
+        if path:
+            self.cache.load(path)
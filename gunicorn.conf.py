@@ -0,0 +1,27 @@
+# Usage: gunicorn -c gunicorn.conf.py
+import os
+
+wsgi_app = 'app:create_app()'
+bind = os.getenv('BIND', '0.0.0.0:5001')
+# embedding_backends divides the cores between this many workers, with the same default
+workers = int(os.getenv('WEB_CONCURRENCY', '2'))
+# create_app runs (and warms up) in the master before workers are forked, so the
+# dataset, spaCy and index pages are shared copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    # The workers save the embedding cache and TF-IDF counts they have grown when they
+    # exit; the master exits last and must not overwrite them with its pre-fork copy.
+    import cache
+    cache.skip_saves_at_exit()
+
+
+def post_fork(server, worker):
+    # Threads don't survive fork, so each worker loads its own embedding model and
+    # starts its own job dispatcher; starting it here also requeues jobs a previous
+    # run left behind without waiting for a new submit.
+    import jobs
+    import warmup
+    warmup.warm_up_worker()
+    jobs.job_queue().start()
@@ -0,0 +1,291 @@
+import hashlib
+import io
+import multiprocessing
+import multiprocessing.util
+import os
+import signal
+import threading
+import time
+import zipfile
+from collections import OrderedDict, namedtuple
+from PyPDF2 import PdfReader
+from docx import Document
+from metrics import timed
+
+INGEST_CACHE_SIZE = int(os.getenv('INGEST_CACHE_SIZE', '256'))
+# Per-document budget: pages past INGEST_MAX_PAGES, or not extracted within
+# INGEST_TIME_BUDGET seconds (parsing included), are dropped and the document is
+# marked as truncated.
+INGEST_MAX_PAGES = int(os.getenv('INGEST_MAX_PAGES', '50'))
+INGEST_TIME_BUDGET = float(os.getenv('INGEST_TIME_BUDGET', '20'))
+# PDFs with at least this many pages are split across INGEST_WORKERS processes.
+INGEST_PARALLEL_PAGES = int(os.getenv('INGEST_PARALLEL_PAGES', '8'))
+INGEST_WORKERS = int(os.getenv('INGEST_WORKERS', str(max(1, (os.cpu_count() or 2) // 2))))
+
+# Legacy .doc files aren't zip-based and python-docx can't read them, so they are refused
+FORMATS = {'.pdf': 'pdf', '.docx': 'docx'}
+
+# pages holds the text of each page (a DOCX is a single page); metadata describes the layout.
+ExtractedDocument = namedtuple('ExtractedDocument', ['text', 'page_count', 'pages', 'metadata', 'sha256'])
+
+
+class UnsupportedFormat(ValueError):
+    pass
+
+
+class ExtractionError(Exception):
+    pass
+
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+# PDFs are extracted in long-lived extractor processes; one that runs over the budget
+# is killed and replaced. They are spawned, not forked from the threaded web worker.
+_context = multiprocessing.get_context('spawn')
+_idle_extractors = []
+_extractors_lock = threading.Lock()
+_extractors_pid = None
+
+
+def detect_format(filename):
+    ext = os.path.splitext(filename or '')[1].lower()
+    if ext not in FORMATS:
+        raise UnsupportedFormat("Unsupported file format")
+    return FORMATS[ext]
+
+
+def sniff_format(stream):
+    """'pdf' or 'docx' judged from the content's leading bytes, or None; rewinds ``stream``."""
+    stream.seek(0)
+    head = stream.read(1024)
+    stream.seek(0)
+    # Readers accept a PDF header anywhere in the first 1 KB
+    if b'%PDF-' in head:
+        return 'pdf'
+    if head.startswith(b'PK\x03\x04'):
+        try:
+            with zipfile.ZipFile(stream) as archive:
+                names = set(archive.namelist())
+        except zipfile.BadZipFile:
+            return None
+        finally:
+            stream.seek(0)
+        return 'docx' if 'word/document.xml' in names else None
+    return None
+
+
+def check_content(stream, kind):
+    if sniff_format(stream) != kind:
+        raise UnsupportedFormat(f"File content is not a valid {kind.upper()} document")
+
+
+_reader = None
+
+
+def _page_text(i):
+    page = _reader.pages[i]
+    box = page.mediabox
+    return page.extract_text() or "", (float(box.width), float(box.height))
+
+
+def _extract_pages(conn, data, max_pages, parallel_pages, workers):
+    """Parse the PDF and send its pages to ``conn`` as they are extracted."""
+    global _reader
+    try:
+        _reader = PdfReader(io.BytesIO(data))
+        page_count = len(_reader.pages)
+        conn.send(('meta', page_count, _reader.is_encrypted))
+        page_limit = min(page_count, max_pages)
+        if page_limit >= parallel_pages and workers > 1:
+            # Forked after parsing, the page workers share the parsed reader
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                for page in pool.imap(_page_text, range(page_limit)):
+                    conn.send(('page',) + page)
+        else:
+            for i in range(page_limit):
+                conn.send(('page',) + _page_text(i))
+        conn.send(('done',))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        _reader = None
+
+
+def _extractor_main(conn):
+    """Extractor process: serve extraction requests from ``conn`` until it is closed.
+
+    It runs in its own process group, so when a document overruns its budget the
+    parent kills it together with any page workers it has forked, mid-page if need be.
+    """
+    os.setpgrp()
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        _extract_pages(conn, *request)
+
+
+def _take_extractor():
+    global _extractors_pid
+    with _extractors_lock:
+        # Extractors belong to the process that started them; a forked worker starts its own
+        if _extractors_pid != os.getpid():
+            _idle_extractors.clear()
+            _extractors_pid = os.getpid()
+        if _idle_extractors:
+            return _idle_extractors.pop()
+    return _new_extractor()
+
+
+def _new_extractor():
+    # Being spawned, the process imports the main script (guarded by __name__ == '__main__')
+    conn, child_conn = _context.Pipe()
+    process = _context.Process(target=_extractor_main, args=(child_conn,), name='pdf-extractor')
+    process.start()
+    child_conn.close()
+    return process, conn
+
+
+def _release_extractor(extractor):
+    with _extractors_lock:
+        if _extractors_pid == os.getpid():
+            _idle_extractors.append(extractor)
+            return
+    _stop_extractor(extractor)
+
+
+def start_extractor():
+    """Have an idle extractor ready, so the first PDF doesn't wait for one to start."""
+    _release_extractor(_take_extractor())
+
+
+def _stop_extractor(extractor):
+    process, conn = extractor
+    conn.close()
+    if process.exitcode is None:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:  # killed before it made its own group
+            process.kill()
+    process.join()
+
+
+def _stop_idle_extractors():
+    with _extractors_lock:
+        extractors = list(_idle_extractors) if _extractors_pid == os.getpid() else []
+        _idle_extractors.clear()
+    for extractor in extractors:
+        _stop_extractor(extractor)
+
+
+# Before multiprocessing joins its (non-daemon) children at exit
+multiprocessing.util.Finalize(None, _stop_idle_extractors, exitpriority=10)
+
+
+def _extract_pdf(data):
+    extractor = _take_extractor()
+    process, conn = extractor
+    deadline = time.monotonic() + INGEST_TIME_BUDGET
+    page_count, encrypted, pages, page_sizes = None, False, [], []
+    timed_out = finished = False
+    try:
+        conn.send((data, INGEST_MAX_PAGES, INGEST_PARALLEL_PAGES, INGEST_WORKERS))
+        while True:
+            if not conn.poll(max(deadline - time.monotonic(), 0)):
+                timed_out = True
+                break
+            message = conn.recv()
+            if message[0] == 'meta':
+                _, page_count, encrypted = message
+            elif message[0] == 'page':
+                pages.append(message[1])
+                page_sizes.append(message[2])
+            elif message[0] == 'error':
+                finished = True
+                raise ExtractionError(message[1])
+            else:
+                finished = True
+                break
+    except (EOFError, OSError):
+        raise ExtractionError("The PDF extraction process exited unexpectedly")
+    finally:
+        if finished:
+            _release_extractor(extractor)
+        else:
+            _stop_extractor(extractor)
+    if page_count is None:
+        raise ExtractionError(f"The PDF could not be parsed within {INGEST_TIME_BUDGET:g} s")
+
+    metadata = {
+        'format': 'pdf',
+        'page_sizes': page_sizes,
+        'chars_per_page': [len(p) for p in pages],
+        'encrypted': encrypted,
+        'pages_extracted': len(pages),
+        'truncated': len(pages) < page_count,
+        'timed_out': timed_out,
+    }
+    # page_count stays the document's real length; only the text is cut short.
+    return "".join(pages), page_count, pages, metadata
+
+
+def _extract_docx(data):
+    doc = Document(io.BytesIO(data))
+    text = "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
+    metadata = {
+        'format': 'docx',
+        'paragraphs': len(doc.paragraphs),
+        'tables': len(doc.tables),
+        'sections': len(doc.sections),
+        'truncated': False,
+        'timed_out': False,
+    }
+    return text, 1, [text], metadata
+
+
+EXTRACTORS = {'pdf': _extract_pdf, 'docx': _extract_docx}
+
+
+@timed('extract')
+def extract_bytes(data, filename):
+    """Extract text from an in-memory document, reusing earlier results for identical content."""
+    kind = detect_format(filename)
+    digest = hashlib.sha256(data).hexdigest()
+    key = (kind, digest)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            _cache.move_to_end(key)
+            return cached
+
+    check_content(io.BytesIO(data), kind)
+    try:
+        text, page_count, pages, metadata = EXTRACTORS[kind](data)
+    except Exception as e:
+        raise ExtractionError(str(e)) from e
+    document = ExtractedDocument(text, page_count, tuple(pages), metadata, digest)
+
+    if metadata['timed_out']:
+        return document  # a time cut may not repeat, so don't pin it in the cache
+
+    with _cache_lock:
+        _cache[key] = document
+        while len(_cache) > INGEST_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return document
+
+
+def extract_upload(file):
+    """Extract text from a werkzeug FileStorage without writing it to disk.
+
+    extract_bytes checks the content against the extension.
+    """
+    detect_format(file.filename)
+    return extract_bytes(file.read(), file.filename)
+
+
+def extract_path(filepath):
+    with open(filepath, 'rb') as f:
+        return extract_bytes(f.read(), filepath)
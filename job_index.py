@@ -0,0 +1,91 @@
+import hashlib
+import os
+import joblib
+from sklearn.feature_extraction.text import TfidfVectorizer
+from similarity_index import JOB_INDEX_KIND, build_similarity_index
+from metrics import timed
+
+JOB_INDEX_PATH = os.getenv('JOB_INDEX_PATH', 'job_index.joblib')
+
+
+def corpus_fingerprint(job_dataset, extractor=''):
+    """Identifies what an index is built from: the dataset rows and ``extractor``, a
+    description of how skills are extracted from them (spaCy model, skill dictionary)."""
+    digest = hashlib.sha256(f'{extractor}\x02'.encode('utf-8'))
+    for title, skills in zip(job_dataset.titles, job_dataset.skill_texts()):
+        digest.update(title.encode('utf-8'))
+        digest.update(b'\x00')
+        digest.update(skills.encode('utf-8'))
+        digest.update(b'\x01')
+    return digest.hexdigest()
+
+
+class JobIndex:
+    """Skill sets, fitted TF-IDF vectorizer and job matrix for the job dataset.
+
+    Built once per dataset so a prediction only has to vectorize the resume. Rows are
+    looked up through ``searcher``, an exact or approximate similarity index
+    (see similarity_index.py).
+    """
+
+    def __init__(self, titles, skill_texts, row_skills, vectorizer, job_matrix, fingerprint, searcher=None):
+        self.titles = titles
+        self.skill_texts = skill_texts
+        self.row_skills = row_skills
+        self.vectorizer = vectorizer
+        self.job_matrix = job_matrix
+        self.fingerprint = fingerprint
+        self.searcher = searcher
+
+    @classmethod
+    def build(cls, job_dataset, extract_skills, kind=JOB_INDEX_KIND, extractor=''):
+        skill_texts = job_dataset.skill_texts()
+        row_skills = [extract_skills(text) for text in skill_texts]
+        all_skills = set()
+        for skills in row_skills:
+            all_skills.update(skills)
+
+        vectorizer = TfidfVectorizer(vocabulary=sorted(all_skills), lowercase=True, ngram_range=(1,3), max_df=0.85, min_df=1, sublinear_tf=True)
+        job_matrix = vectorizer.fit_transform(skill_texts).tocsr()
+        return cls(job_dataset.titles.tolist(), skill_texts, row_skills, vectorizer, job_matrix,
+                   corpus_fingerprint(job_dataset, extractor), build_similarity_index(job_matrix, kind))
+
+    def save(self, path=JOB_INDEX_PATH):
+        joblib.dump(self.__dict__, path)
+
+    @classmethod
+    def load(cls, path=JOB_INDEX_PATH):
+        index = cls.__new__(cls)
+        index.__dict__.update(joblib.load(path))
+        return index
+
+    @timed('job_search')
+    def top_k(self, resume_skills, k=5):
+        resume_vector = self.vectorizer.transform([" ".join(resume_skills)])
+        return self.searcher.search(resume_vector, k).tolist()
+
+
+def load_or_build_job_index(job_dataset, extract_skills, path=None, kind=JOB_INDEX_KIND, extractor=''):
+    path = JOB_INDEX_PATH if path is None else path
+    fingerprint = corpus_fingerprint(job_dataset, extractor)
+    index = None
+    if path and os.path.exists(path):
+        try:
+            index = JobIndex.load(path)
+            if index.fingerprint != fingerprint:
+                index = None
+        except Exception as e:
+            print(f"Error loading job index from {path}: {e}")
+    if index is not None:
+        if getattr(index, 'searcher', None) is not None and index.searcher.kind == kind:
+            return index
+        # Same corpus, different similarity index: keep the extracted skills, rebuild the search structure
+        index.searcher = build_similarity_index(index.job_matrix, kind)
+    else:
+        index = JobIndex.build(job_dataset, extract_skills, kind, extractor)
+    if path:
+        try:
+            index.save(path)
+        except Exception as e:
+            print(f"Error saving job index to {path}: {e}")
+    return index
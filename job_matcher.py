@@ -1,14 +1,18 @@
 from flask import Blueprint, render_template, request, redirect, url_for, flash
 from flask_login import login_required, current_user
-from pymongo import MongoClient
 import os
-import spacy
-import pandas as pd
 from dotenv import load_dotenv
-from duckduckgo_search import DDGS
-from parser import extract_text  # Using your custom parser module
+from functools import lru_cache
+import nlp_runtime
+from ingest import extract_upload
 from score import calculate_ats_score  # Using your custom score module
-from datetime import datetime
+from db import get_db, user_repository
+from jobs import wants_async, enqueue_response
+from skill_dictionary import load_skill_dictionary
+from cache import make_cache, content_hash
+from doc_analysis import analyze_phrases
+from learning_resources import ResourceLookup, make_backend, RESOURCE_CACHE_TTL
+from tfidf_model import TFIDF_MODE, get_tfidf_model
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from werkzeug.utils import secure_filename  # Added for secure filename handling
@@ -16,58 +20,101 @@ from werkzeug.utils import secure_filename  # Added for secure filename handling
 job_matcher_bp = Blueprint('job_matcher', __name__)
 load_dotenv()
 
-# MongoDB setup
-client = MongoClient(os.getenv('MONGO_URI'))
-db = client.job_portal
-users_collection = db.users
+# Scoring results for repeat (resume, job description) submissions
+score_cache = make_cache('score_cache', get_db,
+                         maxsize=int(os.getenv('SCORE_CACHE_SIZE', '1024')),
+                         ttl=int(os.getenv('SCORE_CACHE_TTL', '86400')))
 
-# Load resources at startup
-nlp = spacy.load('en_core_web_sm')
-data_path = 'C:/Users/91938/OneDrive/Desktop/resume project/ResumeOptimization/data.csv'
-df = pd.read_csv(data_path, encoding="ISO-8859-1")
-it_skills = df["IT Skills"].dropna().str.split(",").explode().str.strip().str.lower()
-valid_skills = set(it_skills)
+# Bump when a change to the scoring code changes what it returns
+SCORE_VERSION = '1'
 
-# Temporary upload folder
-UPLOAD_FOLDER = 'uploads'
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Learning-resource lookups; RESOURCE_BACKEND=offline serves a precomputed table
+resource_lookup = ResourceLookup(make_backend(),
+                                 make_cache('resource_cache', get_db, maxsize=4096, ttl=RESOURCE_CACHE_TTL))
+
+STOP_PHRASES = {
+    "communication", "team", "work", "responsibilities", "skills",
+    "development", "experience", "knowledge", "ability", "role", "scripting skills"
+}
 
 def extract_phrases(text):
-    doc = nlp(text.lower())
+    # Works from the same (cached) parse as matcher.extract_key_phrases
+    analysis = analyze_phrases(text)
     phrases = set()
-    stop_phrases = {
-        "communication", "team", "work", "responsibilities", "skills",
-        "development", "experience", "knowledge", "ability", "role", "scripting skills"
-    }
-    for chunk in doc.noun_chunks:
-        phrase = chunk.text.strip()
+    for chunk in analysis.noun_chunks:
+        phrase = chunk.strip()
         if 2 < len(phrase) < 50 and phrase.count(" ") <= 3:
-            if any(char.isalpha() for char in phrase) and phrase not in stop_phrases:
+            if any(char.isalpha() for char in phrase) and phrase not in STOP_PHRASES:
                 phrases.add(phrase)
-    for token in doc:
-        if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop:
-            if len(token.text) > 3 and token.text.lower() not in stop_phrases:
-                phrases.add(token.lemma_.strip())
+    for noun, lemma in analysis.nouns:
+        if len(noun) > 3 and noun.lower() not in STOP_PHRASES:
+            phrases.add(lemma.strip())
     return phrases
 
 def suggest_relevant_skills(job_desc, missing_skills):
     if not missing_skills:
         return []
-    vectorizer = TfidfVectorizer()
-    vectors = vectorizer.fit_transform([job_desc] + missing_skills)
-    similarities = cosine_similarity(vectors[0:1], vectors[1:])
+    if TFIDF_MODE == 'corpus':
+        # Skills weighted by how rare they are across the job corpus, not just this JD
+        similarities = get_tfidf_model().similarities(job_desc, missing_skills)[None, :]
+    else:
+        vectorizer = TfidfVectorizer()
+        vectors = vectorizer.fit_transform([job_desc] + missing_skills)
+        similarities = cosine_similarity(vectors[0:1], vectors[1:])
     sorted_indices = similarities.argsort()[0][::-1]
     return [missing_skills[i] for i in sorted_indices[:3]]
 
-def get_learning_resources(skill):
-    search_query = f"Best {skill} online course with certification"
-    try:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(search_query, max_results=3))[:3]
-            return [{"title": r['title'], "url": r['href']} for r in results] if results else []
-    except Exception as e:
-        print(f"Error fetching certification resources for {skill}: {e}")
-        return []
+@lru_cache(maxsize=None)
+def scoring_fingerprint():
+    """What a cached score depends on besides the texts: the models, TF-IDF counts and skills.
+
+    Changing any of them starts a new set of cache keys, as a changed dataset does for
+    the job index.
+    """
+    parts = [SCORE_VERSION, nlp_runtime.spacy_fingerprint(), nlp_runtime.embedding_fingerprint(),
+             TFIDF_MODE, load_skill_dictionary().fingerprint]
+    if TFIDF_MODE == 'corpus':
+        parts.append(get_tfidf_model().version)
+    return content_hash(*parts)
+
+def match_resume(resume_text, job_desc):
+    cache_key = content_hash(scoring_fingerprint(), resume_text, job_desc)
+    cached = score_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Calculate ATS score using custom score module
+    score = calculate_ats_score(resume_text, job_desc)
+
+    # Extract and filter skills
+    resume_skills = extract_phrases(resume_text)
+    job_skills = extract_phrases(job_desc)
+    valid_skills = load_skill_dictionary()
+    filtered_job_skills = set(skill for skill in job_skills if skill.lower() in valid_skills)
+    filtered_resume_skills = set(skill for skill in resume_skills if skill.lower() in valid_skills)
+    missing_skills = list(filtered_job_skills - filtered_resume_skills)
+
+    # Suggest relevant skills
+    suggested_skills = suggest_relevant_skills(job_desc, missing_skills)
+
+    result = {'score': float(score), 'missing_skills': missing_skills, 'suggested_skills': suggested_skills}
+    score_cache.set(cache_key, result)
+    return result
+
+def analyze_match(resume_text, job_desc):
+    # Score, missing and suggested skills (served from the cache for repeat submissions)
+    match = match_resume(resume_text, job_desc)
+
+    # Get learning resources for suggested skills
+    resources = resource_lookup.lookup_many(match['suggested_skills'])
+    valid_suggested_skills = [skill for skill in match['suggested_skills'] if resources.get(skill)]
+    return {
+        'score': match['score'],
+        'missing_skills': match['missing_skills'],
+        'suggested_skills': valid_suggested_skills,
+        'resources': {skill: resources[skill] for skill in valid_suggested_skills},
+        'job_desc': job_desc
+    }
 
 @job_matcher_bp.route('/job_matcher', methods=['GET', 'POST'])
 @login_required
@@ -87,61 +134,29 @@ def job_matcher():
             flash('Only PDF files are supported', 'danger')
             return redirect(url_for('job_matcher.job_matcher'))
 
-        # Save the file temporarily
         uploaded_filename = secure_filename(file.filename)
-        temp_path = os.path.join(UPLOAD_FOLDER, uploaded_filename)
-        file.save(temp_path)
 
-        # Extract text using custom parser
-        resume_text = extract_text(temp_path)
+        # Extract text straight from the (spooled) upload, no file of our own
+        try:
+            resume_text = extract_upload(file).text
+        except Exception as e:
+            print(f"Error extracting text from resume: {e}")
+            resume_text = ""
         if not resume_text:
-            os.remove(temp_path)  # Clean up even if extraction fails
             flash('Failed to extract text from resume. Ensure it’s a valid PDF.', 'danger')
             return redirect(url_for('job_matcher.job_matcher'))
 
-        # Calculate ATS score using custom score module
-        score = calculate_ats_score(resume_text, job_desc)
+        if wants_async():
+            return enqueue_response('job_matcher', uploaded_filename,
+                                    {'resume_text': resume_text, 'job_desc': job_desc})
 
-        # Extract and filter skills
-        resume_skills = extract_phrases(resume_text)
-        job_skills = extract_phrases(job_desc)
-        filtered_job_skills = set(skill for skill in job_skills if skill.lower() in valid_skills)
-        filtered_resume_skills = set(skill for skill in resume_skills if skill.lower() in valid_skills)
-        missing_skills = list(filtered_job_skills - filtered_resume_skills)
-
-        # Suggest relevant skills
-        suggested_skills = suggest_relevant_skills(job_desc, missing_skills)
-
-        # Get learning resources for suggested skills
-        resources = {skill: get_learning_resources(skill) for skill in suggested_skills}
-        valid_suggested_skills = [skill for skill, res in resources.items() if res]
-        resources = {skill: res for skill, res in resources.items() if res}
+        match = analyze_match(resume_text, job_desc)
 
         # Store submission and output in MongoDB
-        submission = {
-            'filename': uploaded_filename,
-            'resume_text': resume_text,
-            'timestamp': datetime.utcnow(),
-            'module': 'job_matcher',
-            'output': {
-                'score': score,
-                'missing_skills': missing_skills,
-                'suggested_skills': valid_suggested_skills,
-                'resources': resources,
-                'job_desc': job_desc
-            }
-        }
-        users_collection.update_one(
-            {'email': current_user.id},
-            {'$push': {'submissions': submission}},
-            upsert=True
-        )
-
-        # Clean up the temporary file
-        os.remove(temp_path)
-
-        return render_template('job_matcher.html', score=score, missing_skills=missing_skills,
-                               suggested_skills=valid_suggested_skills, resources=resources,
+        user_repository().append_submission(current_user.id, uploaded_filename, resume_text, 'job_matcher', match)
+
+        return render_template('job_matcher.html', score=match['score'], missing_skills=match['missing_skills'],
+                               suggested_skills=match['suggested_skills'], resources=match['resources'],
                                job_desc=job_desc, uploaded_filename=uploaded_filename)
 
     return render_template('job_matcher.html', job_desc=job_desc, uploaded_filename=uploaded_filename)
@@ -0,0 +1,265 @@
+import importlib
+import json
+import multiprocessing
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import Blueprint, jsonify, request, url_for
+from flask_login import login_required, current_user
+from db import user_repository
+
+JOBS_DB_PATH = os.getenv('JOBS_DB_PATH', 'jobs.sqlite3')
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '2'))
+JOB_QUEUE_LIMIT = int(os.getenv('JOB_QUEUE_LIMIT', '50'))
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', '0.5'))
+
+# Analyses that can run in the background: kind -> "module:function". The function
+# gets the job payload as keyword arguments and returns the JSON-serialisable output
+# that is also recorded as the user's submission.
+TASKS = {
+    'ats_score': 'ats_score:score_resume',
+    'job_matcher': 'job_matcher:analyze_match',
+    'job_predictor': 'job_predictor:predict_jobs',
+}
+
+jobs_bp = Blueprint('jobs', __name__)
+
+
+class QueueFull(Exception):
+    pass
+
+
+def run_task(kind, payload):
+    """Entry point in the pool's worker processes."""
+    module_name, func_name = TASKS[kind].split(':')
+    func = getattr(importlib.import_module(module_name), func_name)
+    return func(**payload)
+
+
+class JobQueue:
+    """SQLite-backed job queue drained by a bounded local process pool.
+
+    Every web worker process runs its own dispatcher thread, started by ``start``
+    (gunicorn's post_fork hook); jobs are claimed with a conditional UPDATE, so several
+    processes can share one queue file. Jobs left 'running' by a process that died are
+    put back in the queue on start-up.
+    """
+
+    def __init__(self, path=JOBS_DB_PATH, workers=JOB_WORKERS, limit=JOB_QUEUE_LIMIT):
+        self.path = path
+        self.workers = workers
+        self.limit = limit
+        self._pid = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._slots = None
+        self._pool = None
+        with self._connect() as conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY, kind TEXT, email TEXT, filename TEXT, payload TEXT,
+                status TEXT, result TEXT, error TEXT, worker_pid INTEGER,
+                created_at REAL, started_at REAL, finished_at REAL)""")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, kind, email, filename, payload):
+        if kind not in TASKS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        self.start()
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            # Take the write lock before counting, so concurrent submits can't all pass the limit
+            conn.execute("BEGIN IMMEDIATE")
+            pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+            if pending >= self.limit:
+                raise QueueFull(f"{pending} jobs are already waiting")
+            conn.execute(
+                "INSERT INTO jobs (id, kind, email, filename, payload, status, created_at) VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+                (job_id, kind, email, filename, json.dumps(payload), time.time())
+            )
+        self._wakeup.set()
+        return job_id
+
+    def get(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {key: row[key] for key in ('id', 'kind', 'email', 'filename', 'status', 'error',
+                                         'created_at', 'started_at', 'finished_at')}
+        job['result'] = json.loads(row['result']) if row['result'] else None
+        job['queue_seconds'] = (row['started_at'] - row['created_at']) if row['started_at'] else None
+        job['run_seconds'] = (row['finished_at'] - row['started_at']) if row['finished_at'] and row['started_at'] else None
+        return job
+
+    def metrics(self):
+        with self._connect() as conn:
+            counts = {row['status']: row['n'] for row in
+                      conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status")}
+            timings = {row['kind']: {'finished': row['n'], 'avg_queue_seconds': row['q'], 'avg_run_seconds': row['r'],
+                                     'max_run_seconds': row['m']}
+                       for row in conn.execute(
+                           "SELECT kind, COUNT(*) AS n, AVG(started_at - created_at) AS q, "
+                           "AVG(finished_at - started_at) AS r, MAX(finished_at - started_at) AS m "
+                           "FROM jobs WHERE finished_at IS NOT NULL GROUP BY kind")}
+        return {'status_counts': counts, 'by_kind': timings, 'workers': self.workers, 'queue_limit': self.limit}
+
+    def start(self):
+        """Requeue orphaned jobs and start this process's dispatcher and pool."""
+        # Threads and pools don't survive fork, so each process starts its own.
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._requeue_orphans()
+            self._slots = threading.BoundedSemaphore(self.workers)
+            self._pool = self._new_pool()
+            threading.Thread(target=self._dispatch, name='job-dispatcher', daemon=True).start()
+            self._pid = os.getpid()
+
+    def _new_pool(self):
+        # Spawned, not forked from a threaded web worker with torch and MongoDB clients loaded
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def _requeue_orphans(self):
+        with self._connect() as conn:
+            for row in conn.execute("SELECT id, worker_pid FROM jobs WHERE status = 'running'").fetchall():
+                if not _pid_alive(row['worker_pid']):
+                    conn.execute("UPDATE jobs SET status = 'queued', worker_pid = NULL WHERE id = ? AND status = 'running'",
+                                 (row['id'],))
+
+    def _claim(self):
+        with self._connect() as conn:
+            row = conn.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+            if row is None:
+                return None
+            claimed = conn.execute(
+                "UPDATE jobs SET status = 'running', worker_pid = ?, started_at = ? WHERE id = ? AND status = 'queued'",
+                (os.getpid(), time.time(), row['id'])
+            ).rowcount
+            if not claimed:
+                return None
+            return conn.execute("SELECT id, kind, payload FROM jobs WHERE id = ?", (row['id'],)).fetchone()
+
+    def _requeue(self, job_id):
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE jobs SET status = 'queued', worker_pid = NULL, started_at = NULL "
+                             "WHERE id = ? AND status = 'running'", (job_id,))
+        except sqlite3.Error as e:
+            # Left 'running'; the next start-up requeues it once this process is gone
+            print(f"Error requeueing job {job_id}: {e}")
+
+    def _submit(self, job):
+        args = (run_task, job['kind'], json.loads(job['payload']))
+        try:
+            return self._pool.submit(*args)
+        except BrokenProcessPool:
+            # A pool worker died (e.g. killed for memory) and the pool takes no more work
+            print("Job pool is broken, starting a new one")
+            self._pool = self._new_pool()
+            return self._pool.submit(*args)
+
+    def _dispatch(self):
+        while True:
+            self._slots.acquire()
+            try:
+                job = self._claim()
+            except sqlite3.Error as e:
+                print(f"Error claiming a job: {e}")
+                job = None
+            if job is None:
+                self._slots.release()
+                self._wakeup.wait(JOB_POLL_INTERVAL)
+                self._wakeup.clear()
+                continue
+            try:
+                future = self._submit(job)
+            except Exception as e:
+                print(f"Error dispatching job {job['id']}, putting it back in the queue: {e}")
+                self._requeue(job['id'])
+                self._slots.release()
+                time.sleep(JOB_POLL_INTERVAL)
+                continue
+            future.add_done_callback(lambda f, job_id=job['id']: self._finish(job_id, f))
+
+    def _finish(self, job_id, future):
+        try:
+            result, error = future.result(), None
+        except Exception as e:
+            result, error = None, str(e)
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?",
+                             ('failed' if error else 'done', json.dumps(result), error, time.time(), job_id))
+                row = conn.execute("SELECT kind, email, filename, payload FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if not error:
+                payload = json.loads(row['payload'])
+                user_repository().append_submission(row['email'], row['filename'], payload['resume_text'],
+                                                     row['kind'], result)
+        except Exception as e:
+            print(f"Error storing result of job {job_id}: {e}")
+        finally:
+            self._slots.release()
+            self._wakeup.set()
+
+
+def _pid_alive(pid):
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+_queue = None
+
+
+def job_queue():
+    global _queue
+    if _queue is None:
+        _queue = JobQueue()
+    return _queue
+
+
+def wants_async():
+    return request.values.get('async') in ('1', 'true')
+
+
+def enqueue_response(kind, filename, payload):
+    """Queue an analysis for the current user and answer with its status URL (or 429)."""
+    try:
+        job_id = job_queue().submit(kind, current_user.id, filename, payload)
+    except QueueFull as e:
+        return jsonify({'error': 'Too many analyses are queued, please retry shortly.', 'detail': str(e)}), 429
+    return jsonify({'job_id': job_id, 'status': 'queued',
+                    'status_url': url_for('jobs.job_status', job_id=job_id)}), 202
+
+
+@jobs_bp.route('/jobs/<job_id>')
+@login_required
+def job_status(job_id):
+    job = job_queue().get(job_id)
+    if job is None or job['email'] != current_user.id:
+        return jsonify({'error': 'Job not found'}), 404
+    job.pop('email')
+    return jsonify(job)
+
+
+@jobs_bp.route('/jobs/metrics')
+@login_required
+def job_metrics():
+    return jsonify(job_queue().metrics())
@@ -0,0 +1,128 @@
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from cache import MemoryCache
+from metrics import timed
+
+RESOURCE_BACKEND = os.getenv('RESOURCE_BACKEND', 'ddgs')
+RESOURCE_TABLE_PATH = os.getenv('RESOURCE_TABLE_PATH', 'learning_resources.json')
+RESOURCE_LOOKUP_DEADLINE = float(os.getenv('RESOURCE_LOOKUP_DEADLINE', '4'))
+RESOURCE_LOOKUP_WORKERS = int(os.getenv('RESOURCE_LOOKUP_WORKERS', '8'))
+RESOURCE_CACHE_TTL = int(os.getenv('RESOURCE_CACHE_TTL', str(7 * 24 * 3600)))
+
+
+class DDGSBackend:
+    """Live DuckDuckGo search."""
+
+    def __init__(self, max_results=3):
+        self.max_results = max_results
+
+    def search(self, skill):
+        from duckduckgo_search import DDGS
+
+        search_query = f"Best {skill} online course with certification"
+        with DDGS() as ddgs:
+            results = list(ddgs.text(search_query, max_results=self.max_results))[:self.max_results]
+        return [{"title": r['title'], "url": r['href']} for r in results] if results else []
+
+
+class OfflineBackend:
+    """Serves a precomputed skill -> resources table; no network access."""
+
+    def __init__(self, path=RESOURCE_TABLE_PATH):
+        self.table = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.table = {skill.lower(): resources for skill, resources in json.load(f).items()}
+
+    def search(self, skill):
+        return self.table.get(skill.lower(), [])
+
+
+class StubBackend:
+    """Local stand-in for tests and benchmarks: canned results, optional fake latency."""
+
+    def __init__(self, results=None, delay=0.0):
+        self.results = results
+        self.delay = delay
+
+    def search(self, skill):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.results is not None:
+            return self.results.get(skill, [])
+        return [{"title": f"{skill} course", "url": f"https://example.com/{skill.replace(' ', '-')}"}]
+
+
+BACKENDS = {'ddgs': DDGSBackend, 'offline': OfflineBackend, 'stub': StubBackend}
+
+
+def make_backend(name=RESOURCE_BACKEND):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown resource backend: {name}")
+    return BACKENDS[name]()
+
+
+class ResourceLookup:
+    """Concurrent, cached learning-resource lookups with a per-request deadline."""
+
+    def __init__(self, backend, cache=None, deadline=RESOURCE_LOOKUP_DEADLINE, max_workers=RESOURCE_LOOKUP_WORKERS):
+        self.backend = backend
+        self.cache = cache if cache is not None else MemoryCache(maxsize=4096, ttl=RESOURCE_CACHE_TTL)
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def lookup(self, skill):
+        key = f"resources:{skill.lower()}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        try:
+            resources = self.backend.search(skill)
+        except Exception as e:
+            # Failures aren't cached, so the next request retries the search.
+            print(f"Error fetching certification resources for {skill}: {e}")
+            return []
+        self.cache.set(key, resources)
+        return resources
+
+    @timed('resource_lookup')
+    def lookup_many(self, skills, deadline=None):
+        """Look skills up concurrently; skills still pending at the deadline get no resources."""
+        if not skills:
+            return {}
+        with self._executor_lock:
+            if self._executor is None:
+                # Created on first use so a pre-forked worker doesn't inherit the master's threads.
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='resources')
+        futures = {skill: self._executor.submit(self.lookup, skill) for skill in skills}
+        wait(futures.values(), timeout=self.deadline if deadline is None else deadline)
+        return {skill: future.result() if future.done() else [] for skill, future in futures.items()}
+
+
+def build_offline_table(skills, path=RESOURCE_TABLE_PATH, backend=None):
+    lookup = ResourceLookup(backend or DDGSBackend(), deadline=None)
+    table = {skill: lookup.lookup(skill) for skill in skills}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, indent=2)
+    return table
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Precompute the offline learning-resource table.")
+    arg_parser.add_argument('skills_file', help="Text file with one skill per line")
+    arg_parser.add_argument('--out', default=RESOURCE_TABLE_PATH)
+    args = arg_parser.parse_args()
+    with open(args.skills_file, encoding='utf-8') as f:
+        skills = [line.strip() for line in f if line.strip()]
+    table = build_offline_table(skills, args.out)
+    print(f"Wrote resources for {len(table)} skills to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
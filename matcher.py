@@ -1,59 +1,172 @@
-from sentence_transformers import SentenceTransformer, util
-from sklearn.feature_extraction.text import TfidfVectorizer, ENGLISH_STOP_WORDS
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer, ENGLISH_STOP_WORDS
 from sklearn.metrics.pairwise import cosine_similarity
-from fuzzywuzzy import fuzz
 import numpy as np
-import spacy
+from scipy import sparse
+import logging
 import re
+import nlp_runtime
+from phrase_matcher import PhraseIndex, count_fuzzy_hits
+from doc_analysis import analyze_phrases, analyze_phrases_many
+from metrics import span
+import tfidf_model
+from tfidf_model import TFIDF_MODE, get_tfidf_model
 
+logger = logging.getLogger(__name__)
 
-nlp = spacy.load("en_core_web_sm")
-model = SentenceTransformer('all-MiniLM-L6-v2')
 
 def preprocess(text):
     return ' '.join([word for word in text.lower().split() if word not in ENGLISH_STOP_WORDS])
 
-def extract_key_phrases(text):
-    doc = nlp(text.lower())
+def key_phrases(analysis):
     phrases = set()
 
-    for chunk in doc.noun_chunks:
-        phrase = chunk.text.strip()
+    for chunk in analysis.noun_chunks:
+        phrase = chunk.strip()
         if 2 < len(phrase) < 50 and phrase.count(" ") <= 3:
             if any(char.isalpha() for char in phrase):
                 phrases.add(phrase)
 
-    for token in doc:
-        if token.pos_ in ["NOUN", "PROPN"] and not token.is_stop:
-            if len(token.text) > 3:
-                phrases.add(token.lemma_.strip())
+    for text, lemma in analysis.nouns:
+        if len(text) > 3:
+            phrases.add(lemma.strip())
 
     return list(phrases)
 
+def extract_key_phrases(text):
+    return key_phrases(analyze_phrases(text))
+
+def extract_key_phrases_many(texts):
+    return [key_phrases(analysis) for analysis in analyze_phrases_many(texts)]
+
+def split_sentences(text):
+    return [sent for sent in re.split(r'[.\n]', text) if len(sent.split()) > 5]
+
+def fuzzy_score_from_hits(fuzzy_hits, job_phrases):
+    return min(fuzzy_hits / len(job_phrases), 1) * 100 if job_phrases else 0
+
+def cosine(a, b):
+    return float(np.dot(a, b) / max(np.linalg.norm(a) * np.linalg.norm(b), 1e-8))
+
 def hybrid_match_score(resume_text, job_desc):
     # --- Semantic Similarity ---
-    resume_clean = [sent for sent in re.split(r'[.\n]', resume_text) if len(sent.split()) > 5]
-    job_clean = [sent for sent in re.split(r'[.\n]', job_desc) if len(sent.split()) > 5]
+    resume_clean = split_sentences(resume_text)
+    job_clean = split_sentences(job_desc)
 
-    resume_embed = model.encode(resume_clean, convert_to_tensor=True)
-    job_embed = model.encode(job_clean, convert_to_tensor=True)
+    embedding_service = nlp_runtime.get_embedding_service()
+    resume_embed = embedding_service.encode(resume_clean)
+    job_embed = embedding_service.encode(job_clean)
 
-    semantic_score = float(util.cos_sim(resume_embed.mean(dim=0), job_embed.mean(dim=0))) * 100
+    semantic_score = cosine(resume_embed.mean(axis=0), job_embed.mean(axis=0)) * 100
 
     # --- TF-IDF Similarity ---
-    tfidf = TfidfVectorizer(stop_words="english")
-    tfidf_matrix = tfidf.fit_transform([preprocess(resume_text), preprocess(job_desc)])
-    tfidf_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100
+    with span('tfidf'):
+        if TFIDF_MODE == 'corpus':
+            tfidf_score = corpus_tfidf_scores(preprocess(job_desc), [preprocess(resume_text)])[0] * 100
+        else:
+            tfidf = TfidfVectorizer(stop_words="english")
+            tfidf_matrix = tfidf.fit_transform([preprocess(resume_text), preprocess(job_desc)])
+            tfidf_score = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0] * 100
 
     # --- Fuzzy Matching ---
     resume_phrases = extract_key_phrases(resume_text)
     job_phrases = extract_key_phrases(job_desc)
 
-    fuzzy_hits = sum(1 for j in job_phrases for r in resume_phrases if fuzz.token_set_ratio(j, r) > 85)
-    fuzzy_score = min(fuzzy_hits / len(job_phrases), 1) * 100 if job_phrases else 0
+    with span('fuzzy'):
+        fuzzy_hits = count_fuzzy_hits(job_phrases, resume_phrases)
+    fuzzy_score = fuzzy_score_from_hits(fuzzy_hits, job_phrases)
 
     # --- Weighted Score ---
     final_score = round(0.5 * semantic_score + 0.35 * tfidf_score + 0.15 * fuzzy_score, 2)
 
-    print(f"[DEBUG] Semantic: {semantic_score:.2f}, TF-IDF: {tfidf_score:.2f}, Fuzzy: {fuzzy_score:.2f}, Final: {final_score:.2f}")
+    logger.debug("Semantic: %.2f, TF-IDF: %.2f, Fuzzy: %.2f, Final: %.2f", semantic_score, tfidf_score, fuzzy_score, final_score)
     return final_score
+
+def pairwise_tfidf_scores(job_doc, resume_docs):
+    """Cosine similarity of each resume to the JD under a TF-IDF fitted on just that pair.
+
+    Equivalent to fitting ``TfidfVectorizer`` on ``[resume, job]`` for every resume, but
+    computed from one shared count matrix: with two documents a term's smoothed IDF is 1
+    when both contain it and ``ln(3/2) + 1`` when only one does.
+    """
+    try:
+        counts = CountVectorizer(stop_words="english").fit_transform([job_doc] + resume_docs).tocsr().astype(np.float64)
+    except ValueError:  # empty vocabulary
+        return np.zeros(len(resume_docs))
+    job = counts[0]
+    resumes = counts[1:]
+    unshared_weight = (np.log(1.5) + 1) ** 2
+
+    job_present = (job > 0).astype(np.float64).T
+    resume_sq = resumes.multiply(resumes).tocsr()
+    resume_norm = unshared_weight * np.asarray(resume_sq.sum(axis=1)).ravel() \
+        - (unshared_weight - 1) * np.asarray((resume_sq @ job_present).todense()).ravel()
+
+    job_sq = job.multiply(job).T.tocsr()
+    job_norm = unshared_weight * job_sq.sum() \
+        - (unshared_weight - 1) * np.asarray(((resumes > 0).astype(np.float64) @ job_sq).todense()).ravel()
+
+    dot = np.asarray((resumes @ job.T).todense()).ravel()
+    denom = np.sqrt(resume_norm * job_norm)
+    return np.divide(dot, denom, out=np.zeros_like(dot), where=denom > 0)
+
+def corpus_tfidf_scores(job_doc, resume_docs):
+    """Cosine similarity of each resume to the JD under the corpus-wide TF-IDF model.
+
+    The JD is logged to be counted in the model's document frequencies at its next
+    update (once per distinct JD); until then the counts, and so the scores, stay fixed.
+    """
+    tfidf_model.observe(job_doc)
+    return get_tfidf_model().similarities(job_doc, resume_docs)
+
+def rank_resumes(job_desc, resumes):
+    """Score many resumes against one job description in a single batched pass.
+
+    Returns one dict per resume, best match first, with the same component scores
+    ``hybrid_match_score`` computes for a single pair.
+    """
+    if not resumes:
+        return []
+
+    # --- Semantic Similarity ---
+    embedding_service = nlp_runtime.get_embedding_service()
+    job_embed = embedding_service.encode(split_sentences(job_desc))
+    job_mean = job_embed.mean(axis=0)
+    resume_sentences = [split_sentences(text) for text in resumes]
+    resume_embed = embedding_service.encode([sent for sents in resume_sentences for sent in sents])
+    lengths = np.array([len(sents) for sents in resume_sentences])
+    # Averaging operator: row i holds 1/len_i over resume i's sentences. A resume with no
+    # usable sentences gets a zero mean, and therefore a semantic score of 0.
+    owners = np.repeat(np.arange(len(resumes)), lengths)
+    averaging = sparse.csr_matrix((1.0 / lengths[owners], (owners, np.arange(len(owners)))),
+                                  shape=(len(resumes), len(owners)))
+    resume_means = averaging @ resume_embed if len(owners) else np.zeros((len(resumes), len(job_mean)))
+    norms = np.linalg.norm(resume_means, axis=1) * np.linalg.norm(job_mean)
+    semantic_scores = np.nan_to_num(resume_means @ job_mean / np.maximum(norms, 1e-8)) * 100
+
+    # --- TF-IDF Similarity ---
+    with span('tfidf'):
+        tfidf_scores = (corpus_tfidf_scores if TFIDF_MODE == 'corpus' else pairwise_tfidf_scores)(
+            preprocess(job_desc), [preprocess(text) for text in resumes]) * 100
+
+    # --- Fuzzy Matching ---
+    job_phrases = extract_key_phrases(job_desc)
+    all_resume_phrases = extract_key_phrases_many(resumes)
+    with span('fuzzy'):
+        job_phrase_index = PhraseIndex(job_phrases)
+        fuzzy_scores = np.array([
+            fuzzy_score_from_hits(job_phrase_index.count_hits(PhraseIndex(resume_phrases)), job_phrases)
+            for resume_phrases in all_resume_phrases
+        ], dtype=np.float64)
+
+    # --- Weighted Score ---
+    final_scores = np.round(0.5 * semantic_scores + 0.35 * tfidf_scores + 0.15 * fuzzy_scores, 2)
+
+    ranked = [{
+        'index': i,
+        'score': float(final_scores[i]),
+        'semantic': float(semantic_scores[i]),
+        'tfidf': float(tfidf_scores[i]),
+        'fuzzy': float(fuzzy_scores[i])
+    } for i in range(len(resumes))]
+    ranked.sort(key=lambda r: r['score'], reverse=True)
+    return ranked
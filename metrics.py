@@ -0,0 +1,147 @@
+import bisect
+import cProfile
+import contextlib
+import functools
+import os
+import threading
+import time
+from flask import Blueprint, Response, abort, g, request
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '1') == '1'
+PROFILE_REQUESTS = os.getenv('PROFILE_REQUESTS', '0') == '1'
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_HEADER = 'X-Profile'
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+
+class Histogram:
+    """Latency histogram with one label, rendered in the Prometheus text format.
+
+    Counts are kept per process; with several gunicorn workers each one reports its own.
+    """
+
+    def __init__(self, name, help_text, label, buckets=BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label = label
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, label_value, seconds):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += seconds
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {value: (list(counts), total) for value, (counts, total) in self._series.items()}
+        for value, (counts, total) in sorted(series.items()):
+            label = f'{self.label}="{value}"'
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+            cumulative += counts[-1]
+            lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {cumulative}')
+            lines.append(f'{self.name}_sum{{{label}}} {total}')
+            lines.append(f'{self.name}_count{{{label}}} {cumulative}')
+        return lines
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+
+stage_seconds = Histogram('resume_stage_seconds', 'Time spent in each pipeline stage.', 'stage')
+request_seconds = Histogram('resume_request_seconds', 'Request latency by endpoint.', 'endpoint')
+
+
+class _Span:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        stage_seconds.observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+_noop_span = contextlib.nullcontext()
+
+
+def span(stage):
+    """``with span('tfidf'):`` times the block into the stage histogram (a no-op when disabled)."""
+    return _Span(stage) if METRICS_ENABLED else _noop_span
+
+
+def timed(stage):
+    """Decorator form of ``span``; leaves the function untouched when metrics are disabled."""
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+@metrics_bp.route('/metrics')
+def metrics():
+    if not METRICS_ENABLED:
+        abort(404)
+    lines = stage_seconds.render() + request_seconds.render()
+    return Response("\n".join(lines) + "\n", mimetype='text/plain; version=0.0.4')
+
+
+def reset():
+    stage_seconds.clear()
+    request_seconds.clear()
+
+
+def _before_request():
+    g.request_start = time.perf_counter()
+    if PROFILE_REQUESTS and request.headers.get(PROFILE_HEADER) == '1':
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+
+def _after_request(response):
+    if METRICS_ENABLED and 'request_start' in g:
+        request_seconds.observe(request.endpoint or 'unknown', time.perf_counter() - g.request_start)
+    profiler = g.pop('profiler', None)
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{request.endpoint}.prof")
+        profiler.dump_stats(path)
+        response.headers['X-Profile-File'] = path
+    return response
+
+
+def init_app(app):
+    """Register /metrics and, when enabled, per-request timing and header-triggered profiling.
+
+    Profiling needs PROFILE_REQUESTS=1 on the server and an ``X-Profile: 1`` request header;
+    the cProfile output is written to PROFILE_DIR and named in the ``X-Profile-File`` header.
+    """
+    app.register_blueprint(metrics_bp)
+    if METRICS_ENABLED or PROFILE_REQUESTS:
+        app.before_request(_before_request)
+        app.after_request(_after_request)
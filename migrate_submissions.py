@@ -0,0 +1,52 @@
+"""Move embedded ``users.submissions`` arrays into the ``submissions`` collection.
+
+Usage: python migrate_submissions.py [--dry-run]
+
+Safe to re-run: migrated submissions get a deterministic _id, so a user whose
+migration was interrupted is picked up again without creating duplicates.
+"""
+import argparse
+import hashlib
+from db import get_db
+from submissions import ensure_indexes, store_resume_text, submission_document
+
+
+def migrate_user(db, user, dry_run=False):
+    email = user['email']
+    migrated = 0
+    for position, submission in enumerate(user.get('submissions') or []):
+        resume_text = submission.get('resume_text') or ""
+        if dry_run:
+            migrated += 1
+            continue
+        resume_hash = store_resume_text(db, resume_text)
+        doc = submission_document(email, submission.get('filename'), resume_hash, submission.get('module'),
+                                  submission.get('output'), submission.get('timestamp'))
+        doc['_id'] = hashlib.sha256(f"{email}:{position}:{doc['timestamp']}".encode('utf-8')).hexdigest()
+        db.submissions.replace_one({'_id': doc['_id']}, doc, upsert=True)
+        migrated += 1
+    if not dry_run:
+        db.users.update_one({'_id': user['_id']}, {'$unset': {'submissions': ''}})
+    return migrated
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    arg_parser.add_argument('--dry-run', action='store_true', help="Count submissions without writing")
+    args = arg_parser.parse_args()
+
+    # The app's database, client options and MONGO_DB included
+    db = get_db()
+    ensure_indexes(db)
+
+    users = 0
+    total = 0
+    for user in db.users.find({'submissions': {'$exists': True}}, {'email': 1, 'submissions': 1}):
+        total += migrate_user(db, user, args.dry_run)
+        users += 1
+    action = "Would migrate" if args.dry_run else "Migrated"
+    print(f"{action} {total} submissions from {users} users")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+import os
+import threading
+import spacy
+import embedding_backends
+from cache import save_at_exit
+from embeddings import EmbeddingService, EMBEDDING_CACHE_PATH
+from embedding_backends import EMBEDDING_BACKEND, load_embedding_model
+from metrics import span, timed
+
+SPACY_MODEL = os.getenv('SPACY_MODEL', 'en_core_web_sm')
+
+# Pipeline components each kind of caller can skip. Noun chunks need the tagger and
+# parser, lemmas need the lemmatizer, entities need the NER.
+PHRASES = ('ner',)
+SKILLS = ('lemmatizer',)
+FULL = ()
+
+_lock = threading.Lock()
+_nlp = None
+_sentence_model = None
+_embedding_service = None
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _lock:
+            if _nlp is None:
+                _nlp = spacy.load(SPACY_MODEL)
+    return _nlp
+
+
+def spacy_fingerprint():
+    """The spaCy model's name and version, for keys of anything derived from its parses."""
+    meta = getattr(get_nlp(), 'meta', None) or {}
+    return f"{SPACY_MODEL}@{meta.get('version', '')}"
+
+
+def embedding_fingerprint():
+    """The backend and model the sentence vectors come from."""
+    if EMBEDDING_BACKEND == 'onnx':
+        return f'onnx:{embedding_backends.EMBEDDING_ONNX_DIR}/{embedding_backends.EMBEDDING_ONNX_FILE}'
+    return f'{EMBEDDING_BACKEND}:{embedding_backends.SENTENCE_MODEL}'
+
+
+@timed('spacy')
+def parse(text, disable=FULL):
+    # One shared pipeline; per-call ``disable`` skips components without mutating it.
+    return get_nlp()(text, disable=list(disable))
+
+
+def parse_many(texts, disable=FULL, batch_size=32):
+    with span('spacy'):
+        return list(get_nlp().pipe(texts, disable=list(disable), batch_size=batch_size))
+
+
+def get_sentence_model():
+    global _sentence_model
+    if _sentence_model is None:
+        with _lock:
+            if _sentence_model is None:
+                _sentence_model = load_embedding_model(EMBEDDING_BACKEND)
+    return _sentence_model
+
+
+def get_embedding_service():
+    global _embedding_service
+    if _embedding_service is None:
+        model = get_sentence_model()
+        with _lock:
+            if _embedding_service is None:
+                service = EmbeddingService(model)
+                # Vectors from different backends (and ONNX files) differ slightly, so each
+                # keeps its own cache file
+                cache_path = EMBEDDING_CACHE_PATH
+                if cache_path and EMBEDDING_BACKEND == 'onnx':
+                    model_name = os.path.splitext(embedding_backends.EMBEDDING_ONNX_FILE)[0]
+                    cache_path = f'{cache_path}-onnx-{model_name}'
+                elif cache_path and EMBEDDING_BACKEND != 'torch':
+                    cache_path = f'{cache_path}-{EMBEDDING_BACKEND}'
+                service.load(cache_path)
+                save_at_exit(service.save, cache_path)
+                _embedding_service = service
+    return _embedding_service
+
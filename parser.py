@@ -1,12 +1,7 @@
-import pdfminer.high_level
-import docx2txt
-import os
+from ingest import extract_path, UnsupportedFormat
 
 def extract_text(filepath):
-    ext = os.path.splitext(filepath)[1].lower()
-    if ext == '.pdf':
-        return pdfminer.high_level.extract_text(filepath)
-    elif ext in ['.docx', '.doc']:
-        return docx2txt.process(filepath)
-    else:
+    try:
+        return extract_path(filepath).text
+    except UnsupportedFormat:
         return "Unsupported file format"
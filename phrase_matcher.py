@@ -0,0 +1,98 @@
+import numpy as np
+from scipy import sparse
+from fuzzywuzzy import fuzz, utils
+
+# Upper bound on the job x resume x alphabet cells held at once while bounding a chunk
+_CHUNK_CELLS = 4_000_000
+
+
+class PhraseIndex:
+    """Phrases pre-processed for fast ``fuzz.token_set_ratio`` threshold matching.
+
+    ``token_set_ratio`` is the best of three ``ratio`` calls between the sorted shared
+    tokens (t0) and each side's sorted token set (t1, t2). Every ``ratio`` is at most
+    2*M/(len(x)+len(y)), where M is bounded by the shorter string and by the number of
+    characters the two strings have in common. Those bounds are computed for all pairs
+    with sparse/NumPy ops, and only pairs that can still clear the threshold are scored
+    exactly, so the hit count is the same as scoring every pair.
+    """
+
+    def __init__(self, phrases):
+        self.phrases = list(phrases)
+        self.token_sets = []
+        joined = []
+        for phrase in self.phrases:
+            tokens = set(utils.full_process(phrase, force_ascii=True).split())
+            self.token_sets.append(tokens)
+            joined.append(" ".join(sorted(tokens)))
+        self.lengths = np.array([len(j) for j in joined], dtype=np.float64)
+        self.char_counts = np.zeros((len(joined), 128), dtype=np.int32)
+        for i, j in enumerate(joined):
+            if j:
+                self.char_counts[i] = np.bincount(np.frombuffer(j.encode('ascii'), dtype=np.uint8), minlength=128)
+
+    def __len__(self):
+        return len(self.phrases)
+
+    def count_hits(self, other, threshold=85):
+        """Count (phrase in self, phrase in other) pairs whose token_set_ratio exceeds threshold."""
+        if not len(self) or not len(other):
+            return 0
+
+        vocab = {}
+        for tokens in self.token_sets + other.token_sets:
+            for token in tokens:
+                vocab.setdefault(token, len(vocab))
+        if not vocab:
+            return 0
+        token_lengths = np.zeros(len(vocab))
+        for token, i in vocab.items():
+            token_lengths[i] = len(token)
+        self_tokens = _incidence(self.token_sets, vocab)
+        other_t = _incidence(other.token_sets, vocab).T.tocsr()
+        other_t_len = (sparse.diags(token_lengths) @ other_t).tocsr()
+
+        # ratio() returns round(100 * r), so a score above threshold needs r >= (threshold + 0.5) / 100.
+        cutoff = (threshold + 0.5) / 100 - 1e-9
+        alphabet = np.flatnonzero(self.char_counts.any(axis=0) | other.char_counts.any(axis=0))
+        self_chars = self.char_counts[:, alphabet]
+        other_chars = other.char_counts[:, alphabet]
+        other_len = other.lengths[None, :]
+        chunk = max(1, _CHUNK_CELLS // max(1, len(other) * len(alphabet)))
+
+        hits = 0
+        for start in range(0, len(self), chunk):
+            stop = min(start + chunk, len(self))
+            rows = self_tokens[start:stop]
+            shared_count = (rows @ other_t).toarray()
+            shared_len = (rows @ other_t_len).toarray()
+            self_len = self.lengths[start:stop, None]
+
+            # len(t0): shared tokens joined by single spaces
+            sect_len = np.where(shared_count > 0, shared_len + shared_count - 1, 0)
+            overlap = np.minimum(self_chars[start:stop, None, :], other_chars[None, :, :]).sum(axis=2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                bound = np.maximum.reduce([
+                    2 * sect_len / (sect_len + self_len),
+                    2 * sect_len / (sect_len + other_len),
+                    2 * overlap / (self_len + other_len),
+                ])
+            bound[(self_len == 0) | (other_len == 0)] = 0
+
+            for i, j in zip(*np.nonzero(bound >= cutoff)):
+                if fuzz.token_set_ratio(self.phrases[start + i], other.phrases[j]) > threshold:
+                    hits += 1
+        return hits
+
+
+def _incidence(token_sets, vocab):
+    rows, cols = [], []
+    for row, tokens in enumerate(token_sets):
+        for token in tokens:
+            rows.append(row)
+            cols.append(vocab[token])
+    return sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(len(token_sets), max(len(vocab), 1)))
+
+
+def count_fuzzy_hits(job_phrases, resume_phrases, threshold=85):
+    return PhraseIndex(job_phrases).count_hits(PhraseIndex(resume_phrases), threshold)
@@ -1,4 +1,40 @@
-from matcher import hybrid_match_score
+import argparse
+import json
+import sys
+from matcher import hybrid_match_score, rank_resumes
 
 def calculate_ats_score(resume_text, job_desc):
     return hybrid_match_score(resume_text, job_desc)
+
+def main():
+    from ingest import extract_path
+
+    arg_parser = argparse.ArgumentParser(description="Rank resumes against one job description.")
+    arg_parser.add_argument('job_desc', help="Path to a text file holding the job description")
+    arg_parser.add_argument('resumes', nargs='+', help="Resume files (PDF or DOCX)")
+    arg_parser.add_argument('--top', type=int, default=None, help="Only print the best N resumes")
+    args = arg_parser.parse_args()
+
+    with open(args.job_desc, encoding='utf-8') as f:
+        job_desc = f.read()
+    # Files that can't be read are reported and left out, as batch_score does
+    paths, resume_texts = [], []
+    for path in args.resumes:
+        try:
+            text = extract_path(path).text
+        except Exception as e:
+            print(f"Skipping {path}: {str(e) or type(e).__name__}", file=sys.stderr)
+            continue
+        if not text.strip():
+            print(f"Skipping {path}: no text extracted", file=sys.stderr)
+            continue
+        paths.append(path)
+        resume_texts.append(text)
+
+    ranked = rank_resumes(job_desc, resume_texts)[:args.top]
+    for result in ranked:
+        result['resume'] = paths[result.pop('index')]
+        print(json.dumps(result))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+import os
+import numpy as np
+from scipy import sparse
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+JOB_INDEX_KIND = os.getenv('JOB_INDEX_KIND', 'exact')
+IVF_DIMS = int(os.getenv('IVF_DIMS', '128'))
+IVF_NPROBE = int(os.getenv('IVF_NPROBE', '32'))
+
+# Similarity indexes over the L2-normalised rows of a sparse TF-IDF matrix.
+# ``search(query, k)`` takes a 1 x vocabulary query row and returns the row ids of the
+# k most similar rows, best first, ties broken by row id.
+
+
+def select_top_k(scores, k):
+    """Positions of the k largest scores, best first; ties keep their original order."""
+    if k < len(scores):
+        # Keep every entry tied with the k-th score so the stable sort below picks the same
+        # positions as a full sort would.
+        kth = np.partition(scores, -k)[-k]
+        candidates = np.flatnonzero(scores >= kth)
+    else:
+        candidates = np.arange(len(scores))
+    order = np.argsort(-scores[candidates], kind='stable')
+    return candidates[order[:k]]
+
+
+class ExactIndex:
+    """Brute force: one sparse matrix-vector product over every row."""
+
+    kind = 'exact'
+
+    def __init__(self, matrix):
+        self.matrix = matrix
+
+    @classmethod
+    def build(cls, matrix):
+        return cls(matrix.tocsr())
+
+    def search(self, query, k):
+        scores = (self.matrix @ query.T).toarray().ravel()
+        return select_top_k(scores, k)
+
+
+class IVFIndex:
+    """Inverted-file index over dense (truncated SVD) projections of the rows.
+
+    Rows are clustered with spherical k-means. A query is projected the same way and
+    only the rows in its ``nprobe`` closest clusters are scored, exactly, against the
+    sparse matrix, so the returned scores and order match ``ExactIndex`` for every row
+    the probe reaches.
+    """
+
+    kind = 'ivf'
+
+    def __init__(self, matrix, svd, centroids, list_ids, list_offsets, nprobe=IVF_NPROBE):
+        self.matrix = matrix
+        self.svd = svd
+        self.centroids = centroids
+        self.list_ids = list_ids
+        self.list_offsets = list_offsets
+        self.nprobe = nprobe
+
+    @classmethod
+    def build(cls, matrix, dims=IVF_DIMS, nlist=None, nprobe=IVF_NPROBE, iterations=10, sample_size=65536, seed=0):
+        matrix = matrix.tocsr()
+        rows, features = matrix.shape
+        rng = np.random.default_rng(seed)
+        sample = np.sort(rng.choice(rows, min(rows, sample_size), replace=False))
+
+        svd = TruncatedSVD(max(1, min(dims, features - 1, len(sample) - 1)), random_state=seed)
+        svd.fit(matrix[sample])
+        nlist = nlist or max(1, min(int(4 * np.sqrt(rows)), len(sample) // 32))
+        centroids = _spherical_kmeans(cls._project(svd, matrix[sample]), nlist, iterations, rng)
+
+        assignment = np.concatenate([
+            _nearest_centroid(cls._project(svd, matrix[start:start + 8192]), centroids)
+            for start in range(0, rows, 8192)
+        ]) if rows else np.zeros(0, dtype=np.int64)
+        list_ids = np.argsort(assignment, kind='stable').astype(np.int32)
+        list_offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignment, minlength=len(centroids)), out=list_offsets[1:])
+        return cls(matrix, svd, centroids, list_ids, list_offsets, nprobe)
+
+    @staticmethod
+    def _project(svd, rows):
+        return normalize(svd.transform(rows)).astype(np.float32)
+
+    def search(self, query, k, nprobe=None):
+        nprobe = nprobe or self.nprobe
+        centroid_order = np.argsort(-(self.centroids @ self._project(self.svd, query).ravel()))
+        # Probe at least nprobe clusters, and more if they don't hold k rows between them.
+        lists = []
+        found = 0
+        for probed, c in enumerate(centroid_order):
+            if probed >= nprobe and found >= k:
+                break
+            lists.append(self.list_ids[self.list_offsets[c]:self.list_offsets[c + 1]])
+            found += len(lists[-1])
+        candidates = np.sort(np.concatenate(lists)) if lists else np.zeros(0, dtype=np.int32)
+        scores = (self.matrix[candidates] @ query.T).toarray().ravel()
+        return candidates[select_top_k(scores, k)]
+
+
+def _nearest_centroid(vectors, centroids):
+    return np.argmax(vectors @ centroids.T, axis=1)
+
+
+def _spherical_kmeans(vectors, nlist, iterations, rng):
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)]
+    for _ in range(iterations):
+        assignment = _nearest_centroid(vectors, centroids)
+        membership = sparse.csr_matrix((np.ones(len(vectors), dtype=np.float32), (assignment, np.arange(len(vectors)))),
+                                       shape=(nlist, len(vectors)))
+        sums = np.asarray(membership @ vectors)
+        empty = np.flatnonzero(np.linalg.norm(sums, axis=1) == 0)
+        sums[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+        centroids = normalize(sums).astype(np.float32)
+    return centroids
+
+
+INDEX_KINDS = {
+    'exact': ExactIndex,
+    'ivf': IVFIndex,
+}
+
+
+def build_similarity_index(matrix, kind=JOB_INDEX_KIND):
+    if kind not in INDEX_KINDS:
+        raise ValueError(f"Unknown similarity index: {kind}")
+    return INDEX_KINDS[kind].build(matrix)
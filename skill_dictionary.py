@@ -0,0 +1,95 @@
+import hashlib
+from collections import deque, namedtuple
+from functools import cached_property, lru_cache
+from dataset import get_dataset
+
+SkillMatch = namedtuple('SkillMatch', ['skill', 'start', 'end'])
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+class SkillDictionary:
+    """Aho–Corasick automaton over a set of lower-cased skills.
+
+    ``find`` reports every skill occurrence in one pass over the text. A skill that
+    starts (or ends) with a word character only matches where the neighbouring text
+    character is not one, so "r" does not match inside "docker" but "c++" and ".net"
+    still match next to punctuation.
+    """
+
+    def __init__(self, skills):
+        self.skills = sorted({skill.strip().lower() for skill in skills if skill and skill.strip()})
+        self._skill_set = frozenset(self.skills)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for index, skill in enumerate(self.skills):
+            state = 0
+            for ch in skill:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                state = nxt
+            self._out[state] = self._out[state] + (index,)
+
+        # Breadth-first fill of failure links; each state's outputs include those of its fail chain.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    @classmethod
+    def from_series(cls, series):
+        return cls(series.dropna().str.split(",").explode())
+
+    def __contains__(self, phrase):
+        return phrase.strip().lower() in self._skill_set
+
+    def __len__(self):
+        return len(self.skills)
+
+    @cached_property
+    def fingerprint(self):
+        return hashlib.sha256("\n".join(self.skills).encode('utf-8')).hexdigest()
+
+    def find(self, text):
+        text = text.lower()
+        goto, fail, out, skills = self._goto, self._fail, self._out, self.skills
+        length = len(text)
+        matches = []
+        state = 0
+        for pos, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                skill = skills[index]
+                start = pos - len(skill) + 1
+                end = pos + 1
+                if _is_word_char(skill[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(skill[-1]) and end < length and _is_word_char(text[end]):
+                    continue
+                matches.append(SkillMatch(skill, start, end))
+        return matches
+
+    def matched_skills(self, text):
+        return {match.skill for match in self.find(text)}
+
+
+@lru_cache(maxsize=None)
+def load_skill_dictionary(data_path=None):
+    """Build (once per process and path) the dictionary of IT skills in the job dataset."""
+    return SkillDictionary(get_dataset(data_path).it_skill_vocabulary())
@@ -0,0 +1,60 @@
+import hashlib
+from datetime import datetime
+from metrics import timed
+
+# Submission history lives in its own collection, one document per submission.
+# Resume text is stored once per distinct content in ``resume_texts`` and referenced by hash.
+
+
+def ensure_indexes(db):
+    db.submissions.create_index([('email', 1), ('timestamp', -1)])
+    db.submissions.create_index([('email', 1), ('module', 1), ('timestamp', -1)])
+
+
+def store_resume_text(db, resume_text):
+    resume_hash = hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+    db.resume_texts.update_one(
+        {'_id': resume_hash},
+        {'$setOnInsert': {'text': resume_text, 'created_at': datetime.utcnow()}},
+        upsert=True
+    )
+    return resume_hash
+
+
+def get_resume_text(db, resume_hash):
+    doc = db.resume_texts.find_one({'_id': resume_hash}, {'text': 1})
+    return doc['text'] if doc else None
+
+
+def submission_document(email, filename, resume_hash, module, output, timestamp=None):
+    return {
+        'email': email,
+        'filename': filename,
+        'resume_hash': resume_hash,
+        'timestamp': timestamp or datetime.utcnow(),
+        'module': module,
+        'output': output
+    }
+
+
+@timed('mongo_write')
+def record_submission(db, email, filename, resume_text, module, output, timestamp=None):
+    resume_hash = store_resume_text(db, resume_text)
+    db.submissions.insert_one(submission_document(email, filename, resume_hash, module, output, timestamp))
+    return resume_hash
+
+
+def get_history(db, email, page=1, per_page=20, module=None):
+    query = {'email': email}
+    if module:
+        query['module'] = module
+    page = max(page, 1)
+    per_page = min(max(per_page, 1), 100)
+    cursor = db.submissions.find(query, {'email': 0}) \
+        .sort('timestamp', -1).skip((page - 1) * per_page).limit(per_page)
+    return {
+        'page': page,
+        'per_page': per_page,
+        'total': db.submissions.count_documents(query),
+        'items': list(cursor)
+    }
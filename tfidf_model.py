@@ -0,0 +1,219 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+from cache import content_hash
+from dataset import get_dataset
+
+# pair: fit TF-IDF on each (resume, JD) pair as before; corpus: use CorpusTfidf
+TFIDF_MODE = os.getenv('TFIDF_MODE', 'pair')
+TFIDF_MODEL_PATH = os.getenv('TFIDF_MODEL_PATH', 'tfidf_model.npz')
+TFIDF_FEATURES = int(os.getenv('TFIDF_FEATURES', str(2 ** 18)))
+# How many recent document hashes are kept to skip exact repeats
+TFIDF_SEEN_SIZE = int(os.getenv('TFIDF_SEEN_SIZE', '50000'))
+
+
+class CorpusTfidf:
+    """TF-IDF with document frequencies from the job corpus plus the JDs seen since.
+
+    Terms are hashed into ``n_features`` buckets and English stop words are dropped, as
+    in pair mode. ``add_documents`` counts new documents in O(their terms) and only
+    invalidates the cached IDF vector; scoring is a ``transform`` with no fitting.
+    A document that is among the last ``seen_size`` seen (by content hash) is not
+    counted again, so memory stays fixed however many documents are added.
+    """
+
+    def __init__(self, n_features=TFIDF_FEATURES, df=None, n_docs=0, seen=(), corpus_sha256=None,
+                 seen_size=TFIDF_SEEN_SIZE):
+        self.hasher = HashingVectorizer(n_features=n_features, alternate_sign=False, norm=None, stop_words='english')
+        self.n_features = n_features
+        self.df = df if df is not None else np.zeros(n_features, dtype=np.int64)
+        self.n_docs = n_docs
+        self.seen_size = seen_size
+        self.seen = OrderedDict.fromkeys(list(seen)[-seen_size:])
+        self.corpus_sha256 = corpus_sha256
+        self._idf = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_dataset(cls, job_dataset, n_features=TFIDF_FEATURES):
+        model = cls(n_features, corpus_sha256=job_dataset.sha256)
+        model.add_documents([f"{title} {skills}" for title, skills in zip(job_dataset.titles, job_dataset.skill_texts())],
+                            dedupe=False)
+        return model
+
+    def add_documents(self, texts, dedupe=True):
+        if dedupe:
+            keys = [content_hash(text) for text in texts]
+            with self._lock:
+                new_texts = []
+                for text, key in zip(texts, keys):
+                    if key in self.seen:
+                        self.seen.move_to_end(key)
+                    else:
+                        self.seen[key] = None
+                        new_texts.append(text)
+                while len(self.seen) > self.seen_size:
+                    self.seen.popitem(last=False)
+                texts = new_texts
+        if not texts:
+            return
+        counts = self.hasher.transform(texts).tocsr()
+        # CSR rows hold each hashed term once, so the column counts are document frequencies
+        df = np.bincount(counts.indices, minlength=self.n_features)
+        with self._lock:
+            self.df += df
+            self.n_docs += len(texts)
+            self._idf = None
+
+    @property
+    def version(self):
+        """Identifies the document counts: the corpus they were built from and how many documents they hold."""
+        return f'{self.corpus_sha256}:{self.n_features}:{self.n_docs}'
+
+    def idf(self):
+        idf = self._idf
+        if idf is None:
+            with self._lock:
+                # Smoothed as in TfidfVectorizer: ln((1 + n) / (1 + df)) + 1
+                idf = self._idf = np.log((1 + self.n_docs) / (1 + self.df)) + 1
+        return idf
+
+    def transform(self, texts):
+        """L2-normalised (1 + log tf) * idf rows for ``texts``."""
+        matrix = self.hasher.transform(texts).tocsr()
+        # Sublinear TF, as in the job index, so repeated filler words don't swamp the skills
+        matrix.data = (1 + np.log(matrix.data)) * self.idf()[matrix.indices]
+        return normalize(matrix, copy=False)
+
+    def similarities(self, query, texts):
+        """Cosine similarity of each of ``texts`` to ``query``."""
+        if not texts:
+            return np.zeros(0)
+        matrix = self.transform([query] + list(texts))
+        return (matrix[1:] @ matrix[0].T).toarray().ravel()
+
+    def save(self, path=TFIDF_MODEL_PATH):
+        with self._lock:
+            # Oldest first, so loading keeps the most recent
+            df, n_docs, seen = self.df.copy(), self.n_docs, list(self.seen)
+        tmp_path = f'{path}.{os.getpid()}.tmp.npz'
+        np.savez(tmp_path, df=df, n_docs=n_docs, seen=np.array(seen, dtype='S64'),
+                 corpus_sha256=np.array(self.corpus_sha256 or ''))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=TFIDF_MODEL_PATH):
+        with np.load(path) as data:
+            df = data['df'].astype(np.int64)
+            seen = data['seen'].astype('U64').tolist()
+            return cls(len(df), df, int(data['n_docs']), seen, str(data['corpus_sha256']) or None)
+
+
+def load_or_build_tfidf_model(job_dataset, path=TFIDF_MODEL_PATH, n_features=TFIDF_FEATURES):
+    """The saved model if it was built from this dataset with the same hashing size, else a fresh one."""
+    if path and os.path.exists(path):
+        try:
+            model = CorpusTfidf.load(path)
+            if model.corpus_sha256 == job_dataset.sha256 and model.n_features == n_features:
+                return model
+        except Exception as e:
+            print(f"Error loading TF-IDF model from {path}: {e}")
+    model = CorpusTfidf.from_dataset(job_dataset, n_features)
+    if path:
+        try:
+            model.save(path)
+        except Exception as e:
+            print(f"Error saving TF-IDF model to {path}: {e}")
+    return model
+
+
+def pending_path(path):
+    """The log of job descriptions seen by the workers and not yet counted into the model at ``path``."""
+    return f'{path}.pending.jsonl'
+
+
+def update_tfidf_model(job_dataset, path=TFIDF_MODEL_PATH):
+    """Count the job descriptions logged since the last update into the saved model, and return it.
+
+    Workers only read the model, so this runs where no other process is scoring with
+    it: in gunicorn's master before it forks (warmup.warm_up), or offline with
+    ``python tfidf_model.py``.
+    """
+    model = load_or_build_tfidf_model(job_dataset, path)
+    if not path:
+        return model
+    # Move the log aside first, so job descriptions logged meanwhile wait for the next update
+    updating = f'{pending_path(path)}.{os.getpid()}'
+    try:
+        os.replace(pending_path(path), updating)
+    except FileNotFoundError:
+        return model
+    texts = []
+    with open(updating, encoding='utf-8') as f:
+        for line in f:
+            try:
+                texts.append(json.loads(line)['text'])
+            except (ValueError, KeyError):
+                continue
+    model.add_documents(texts)
+    try:
+        model.save(path)
+        os.remove(updating)
+    except Exception as e:
+        print(f"Error saving TF-IDF model to {path}: {e}")
+    return model
+
+
+_lock = threading.Lock()
+_model = None
+# Job descriptions this process has already logged, so repeats are logged once
+_logged = OrderedDict()
+
+
+def get_tfidf_model(update=False):
+    """This process's model, loaded once; with ``update``, update_tfidf_model runs first.
+
+    The document counts stay as loaded, so every worker scores a pair the same way
+    until the model is updated and the workers restart.
+    """
+    global _model
+    if _model is None:
+        with _lock:
+            if _model is None:
+                if update:
+                    _model = update_tfidf_model(get_dataset(), TFIDF_MODEL_PATH)
+                else:
+                    _model = load_or_build_tfidf_model(get_dataset(), TFIDF_MODEL_PATH)
+    return _model
+
+
+def observe(text):
+    """Log a job description to be counted in the document frequencies at the next update."""
+    key = content_hash(text)
+    if key in get_tfidf_model().seen or not TFIDF_MODEL_PATH:
+        return
+    with _lock:
+        if key in _logged:
+            return
+        _logged[key] = None
+        while len(_logged) > TFIDF_SEEN_SIZE:
+            _logged.popitem(last=False)
+    line = (json.dumps({'text': text}) + '\n').encode('utf-8')
+    try:
+        # One O_APPEND write, so lines from concurrent workers don't interleave
+        fd = os.open(pending_path(TFIDF_MODEL_PATH), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        print(f"Error logging a job description for the TF-IDF model: {e}")
+
+
+if __name__ == '__main__':
+    updated = update_tfidf_model(get_dataset(), TFIDF_MODEL_PATH)
+    print(f"{TFIDF_MODEL_PATH}: {updated.n_docs} documents")
@@ -0,0 +1,38 @@
+import os
+from tempfile import SpooledTemporaryFile
+from flask import Request, current_app, request, jsonify, flash, redirect
+from werkzeug.exceptions import RequestEntityTooLarge
+
+# Whole-request cap; larger uploads are refused with 413 before they are read
+MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(10 * 1024 * 1024)))
+# Uploaded files stay in memory up to this size, then move to an anonymous temp file
+UPLOAD_SPOOL_SIZE = int(os.getenv('UPLOAD_SPOOL_SIZE', str(1024 * 1024)))
+
+
+class UploadRequest(Request):
+    """Request whose file parts are spooled in memory instead of always going to disk.
+
+    A part past UPLOAD_SPOOL_SIZE rolls over to a ``TemporaryFile``, which is unlinked
+    as soon as it is created, so it never collides with another upload and is gone
+    once the request is over, whether or not the request succeeded.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=UPLOAD_SPOOL_SIZE, mode='w+b')
+
+
+def too_large(e):
+    limit = current_app.config['MAX_CONTENT_LENGTH'] / (1024 * 1024)
+    message = f"File is too large; the limit is {limit:.3g} MB."
+    # Only the query string: reading the form is what raised this error
+    if request.args.get('async') in ('1', 'true'):
+        return jsonify({'error': message}), 413
+    flash(message, 'danger')
+    return redirect(request.path)
+
+
+def init_app(app):
+    app.request_class = UploadRequest
+    if app.config.get('MAX_CONTENT_LENGTH') is None:
+        app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+    app.register_error_handler(RequestEntityTooLarge, too_large)
@@ -0,0 +1,109 @@
+import gc
+import time
+from flask import Blueprint, jsonify
+import ingest
+import metrics
+import nlp_runtime
+from ats_score import score_resume
+from db import get_client
+from dataset import get_dataset
+from job_matcher import extract_phrases
+from job_predictor import get_job_index, predict_job_title
+from matcher import extract_key_phrases, split_sentences
+from skill_dictionary import load_skill_dictionary
+from tfidf_model import TFIDF_MODE, get_tfidf_model
+
+health_bp = Blueprint('health', __name__)
+
+SAMPLE_RESUME = (
+    "Data engineer with five years of experience building batch and streaming pipelines.\n"
+    "Developed services in Python and SQL on AWS, deployed with Docker and Kubernetes.\n"
+    "Led a team of three engineers and reduced reporting latency with Spark and Airflow."
+)
+SAMPLE_JOB_DESC = (
+    "We are hiring a data engineer to design and run data pipelines on AWS.\n"
+    "Strong Python and SQL skills and experience with Spark, Airflow and Docker are required."
+)
+
+# Whether this process can serve requests without loading anything first, and how long
+# each warm-up stage took. Set in the gunicorn master, then inherited by every worker.
+state = {'ready': False, 'warmup_seconds': {}}
+
+
+def _stage(name, func):
+    start = time.perf_counter()
+    result = func()
+    state['warmup_seconds'][name] = round(time.perf_counter() - start, 3)
+    return result
+
+
+def warm_up():
+    """Load the models and indexes that are safe to share across fork, and exercise them.
+
+    Runs once in create_app, which gunicorn (preload_app) calls in the master before it
+    forks the workers, so they share the loaded pages copy-on-write. Nothing here
+    starts threads: the embedding model is left to warm_up_worker.
+    """
+    _stage('dataset', get_dataset)
+    _stage('skill_dictionary', load_skill_dictionary)
+    _stage('spacy', nlp_runtime.get_nlp)
+    job_index = _stage('job_index', get_job_index)
+    if TFIDF_MODE == 'corpus':
+        # Count the job descriptions the workers logged since the last start
+        _stage('tfidf_model', lambda: get_tfidf_model(update=True))
+
+    def inference():
+        # Only scoring steps that record nothing: no submissions, cached scores or
+        # observed job descriptions come out of the warm-up.
+        score_resume(SAMPLE_RESUME, 1)
+        extract_key_phrases(SAMPLE_RESUME)
+        extract_phrases(SAMPLE_JOB_DESC)
+        predict_job_title(SAMPLE_RESUME, job_index)
+        if TFIDF_MODE == 'corpus':
+            get_tfidf_model().transform([SAMPLE_RESUME, SAMPLE_JOB_DESC])
+
+    _stage('inference', inference)
+    # Workers should only report their own requests' timings
+    metrics.reset()
+    # Move the loaded objects out of the collector's generations so workers don't
+    # dirty (and copy) their pages just by running a GC pass after fork.
+    gc.collect()
+    gc.freeze()
+    state['ready'] = True
+
+
+def warm_up_worker():
+    """Start a PDF extractor, load the embedding model and run a dummy encode in this process.
+
+    Called from gunicorn's post_fork hook, before the worker takes requests. torch and
+    ONNX Runtime set up their thread pools on load and first use, and those threads
+    would not survive being forked, so each worker loads its own model.
+    """
+    if not state['warmup_seconds']:
+        return  # create_app didn't warm up (WARMUP=0): the model loads on first use
+    _stage('pdf_extractor', ingest.start_extractor)
+    _stage('embedding_model', nlp_runtime.get_embedding_service)
+    _stage('embedding_inference',
+           lambda: nlp_runtime.get_embedding_service().encode(split_sentences(SAMPLE_RESUME + "\n" + SAMPLE_JOB_DESC)))
+    metrics.reset()
+
+
+@health_bp.route('/healthz')
+def healthz():
+    """Liveness: the process is up and answering."""
+    return jsonify({'status': 'ok'})
+
+
+@health_bp.route('/readyz')
+def readyz():
+    """Readiness: warmed up, and MongoDB is reachable."""
+    checks = {'warmed_up': state['ready']}
+    try:
+        get_client().admin.command('ping')
+        checks['mongo'] = True
+    except Exception as e:
+        print(f"Readiness check could not reach MongoDB: {e}")
+        checks['mongo'] = False
+    ready = all(checks.values())
+    body = {'status': 'ready' if ready else 'not ready', 'checks': checks, 'warmup_seconds': state['warmup_seconds']}
+    return jsonify(body), 200 if ready else 503